@@ -0,0 +1,48 @@
+"""Compare memory used by headline dicts and slotted ``Headline`` records.
+
+Run with ``python -m benchmarks.records_memory [count]``.
+"""
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from records import Headline
+
+
+def _as_dict(title: str) -> dict:
+    return {
+        "title": title,
+        "sentiment": 0.25,
+        "relevance_score": 1.0,
+        "keyword": "Apple",
+        "publishedAt": "2025-07-30T12:00:00Z",
+        "cluster_size": 1,
+    }
+
+
+def _as_record(title: str) -> Headline:
+    return Headline(title, 1.0, "Apple", "2025-07-30T12:00:00Z", 1, 0.25)
+
+
+def measure(build: Callable[[str], object], titles: List[str]) -> int:
+    """Return peak bytes allocated while building one item per title."""
+    tracemalloc.start()
+    items = [build(t) for t in titles]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return peak
+
+
+def main(count: int = 1_000_000) -> None:
+    titles = [f"Apple shares rise on iPhone demand #{i}" for i in range(count)]
+    dict_peak = measure(_as_dict, titles)
+    record_peak = measure(_as_record, titles)
+    print(f"{count} headlines")
+    print(f"dicts:   {dict_peak / 1e6:8.1f} MB ({dict_peak / count:.0f} B/item)")
+    print(f"records: {record_peak / 1e6:8.1f} MB ({record_peak / count:.0f} B/item)")
+    print(f"reduction: {1 - record_peak / dict_peak:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
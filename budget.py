@@ -0,0 +1,159 @@
+import json
+import logging
+import math
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from run_model import SymbolResult
+
+REPORT_DIR = Path("reports")
+BUDGET_STATE = Path("history/budget_state.json")
+
+
+@dataclass(slots=True)
+class Allocation:
+    """How much fetch depth and LLM scoring one symbol gets this run."""
+
+    symbol: str
+    activity: float
+    page_size: int = 0
+    llm_calls: int = 0
+
+    @property
+    def skipped(self) -> bool:
+        return self.page_size == 0
+
+
+class BudgetPlanner:
+    """Split per-run NewsAPI and OpenAI quotas across symbols by recent activity.
+
+    Activity is the average news volume per report plus the spread of
+    prediction scores over the last ``history`` reports. News volume is
+    NewsAPI's ``totalResults`` for the symbol, which the page sizes handed out
+    here do not cap; reports without it fall back to the articles kept. Quiet
+    symbols are
+    polled only every ``quiet_every`` runs, and symbols beyond the news quota
+    are skipped; both carry their last prediction forward marked as stale.
+    """
+
+    def __init__(self, report_dir: Path = REPORT_DIR, state_path: Path = BUDGET_STATE,
+                 history: int = 14, quiet_every: int = 3, base_page: int = 10,
+                 min_page: int = 5, max_page: int = 50) -> None:
+        self.report_dir = Path(report_dir)
+        self.state_path = Path(state_path)
+        self.history = history
+        self.quiet_every = quiet_every
+        self.base_page = base_page
+        self.min_page = min_page
+        self.max_page = max_page
+        self.reports = self._load_reports()
+        self.state = self._load_state()
+
+    def _load_reports(self) -> List[Dict]:
+        reports = []
+        for path in sorted(self.report_dir.glob("stock_report_*.json"))[-self.history:]:
+            try:
+                reports.append(json.loads(path.read_text()))
+            except Exception as e:  # pragma: no cover - logging
+                logging.exception("Failed to parse %s: %s", path, e)
+        return reports
+
+    def _load_state(self) -> Dict:
+        state = {"run": 0, "last_polled": {}}
+        if self.state_path.exists():
+            try:
+                state.update(json.loads(self.state_path.read_text()))
+            except Exception as e:  # pragma: no cover - logging
+                logging.exception("Failed to parse budget state: %s", e)
+        return state
+
+    def save(self) -> None:
+        self.state_path.parent.mkdir(exist_ok=True)
+        self.state_path.write_text(json.dumps(self.state))
+
+    def activity(self, symbols: List[str]) -> Dict[str, float | None]:
+        """Return activity per symbol, ``None`` for symbols without history."""
+        volume: Dict[str, List[float]] = {s: [] for s in symbols}
+        kept: Dict[str, List[float]] = {s: [] for s in symbols}
+        scores: Dict[str, List[float]] = {s: [] for s in symbols}
+        for report in self.reports:
+            for result in report.get("results", []):
+                symbol = result.get("symbol")
+                if symbol not in kept or result.get("stale"):
+                    continue
+                if result.get("news_volume") is not None:
+                    volume[symbol].append(math.log1p(int(result["news_volume"])))
+                items = result.get("items")
+                if items is None:
+                    articles = len(result.get("headlines", []))
+                else:
+                    articles = sum(int(i.get("cluster_size", 1)) for i in items)
+                kept[symbol].append(math.log1p(articles))
+                scores[symbol].append(float(result.get("prediction", {}).get("score", 0.0)))
+        out: Dict[str, float | None] = {}
+        for symbol in symbols:
+            # Articles kept are capped by earlier allocations, so they only
+            # stand in for symbols without a recorded news volume.
+            velocity = volume[symbol] or kept[symbol]
+            if not velocity:
+                out[symbol] = None
+                continue
+            spread = statistics.pstdev(scores[symbol]) if len(scores[symbol]) > 1 else 0.0
+            # Volume is on a log scale; a score spread of 0.25 (on -1..1)
+            # weighs like roughly tripling the news volume.
+            out[symbol] = statistics.fmean(velocity) + spread * 4
+        return out
+
+    def plan(self, symbols: List[str], news_quota: int, llm_quota: int) -> Dict[str, Allocation]:
+        """Allocate this run's quotas and record which symbols are polled."""
+        raw = self.activity(symbols)
+        known = [a for a in raw.values() if a is not None]
+        # Symbols without history are treated as the most active so they get a first look.
+        top = max(known, default=1.0)
+        activity = {s: (top if a is None else a) for s, a in raw.items()}
+        quiet_cut = statistics.quantiles(known, n=4)[0] if len(known) >= 4 else 0.0
+
+        run = int(self.state["run"]) + 1
+        last = self.state["last_polled"]
+        due = [
+            s for s in symbols
+            if activity[s] > quiet_cut or run - int(last.get(s, -self.quiet_every)) >= self.quiet_every
+        ]
+        due.sort(key=lambda s: activity[s], reverse=True)
+        polled = due[:news_quota]
+
+        allocations = {s: Allocation(s, activity[s]) for s in symbols}
+        total = sum(activity[s] for s in polled)
+        for s in polled:
+            share = activity[s] / total if total else 1 / len(polled)
+            alloc = allocations[s]
+            # An average symbol gets ``base_page`` articles; busier ones get more.
+            alloc.page_size = max(self.min_page, min(self.max_page, round(self.base_page * share * len(polled))))
+            alloc.llm_calls = int(share * llm_quota)
+            last[s] = run
+        # Hand out LLM calls lost to rounding, most active first.
+        spare = llm_quota - sum(a.llm_calls for a in allocations.values())
+        for s in polled[:max(spare, 0)]:
+            allocations[s].llm_calls += 1
+        self.state["run"] = run
+        return allocations
+
+    def carry_forward(self, symbol: str) -> SymbolResult | None:
+        """Return the latest prediction for ``symbol`` marked stale.
+
+        The stale marker keeps the evaluator, and so calibration, from counting
+        the same prediction again under this run's date. The fidelity of the
+        original run and its news volume are dropped because they describe that
+        run, not this one.
+        """
+        for report in reversed(self.reports):
+            for result in report.get("results", []):
+                if result.get("symbol") == symbol:
+                    carried = SymbolResult.from_dict(result)
+                    carried.as_of = carried.as_of or report.get("date")
+                    carried.fidelity = "full"
+                    carried.news_volume = None
+                    return carried
+        return None
@@ -0,0 +1,171 @@
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from gather.sentiment_analyzer import confidence_label
+from run_model import SymbolResult
+
+LOG_PATH = Path("history/prediction_accuracy_log.jsonl")
+MODEL_PATH = Path("history/calibration_model.json")
+BINS = 10
+GLOBAL = "*"
+# The evaluator re-appends records for up to 15 earlier reports, so keys
+# older than this cannot show up again and are dropped from the seen set.
+SEEN_DAYS = 45
+
+
+def isotonic(rates: List[float], weights: List[float]) -> List[float]:
+    """Return the weighted non-decreasing fit of ``rates`` (pool adjacent violators)."""
+    blocks: List[List[float]] = []  # [rate, weight, size]
+    for rate, weight in zip(rates, weights):
+        blocks.append([rate, weight, 1])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            rate2, w2, n2 = blocks.pop()
+            rate1, w1, n1 = blocks.pop()
+            w = w1 + w2
+            blocks.append([(rate1 * w1 + rate2 * w2) / w if w else (rate1 + rate2) / 2, w, n1 + n2])
+    fitted: List[float] = []
+    for rate, _, size in blocks:
+        fitted.extend([rate] * size)
+    return fitted
+
+
+class CalibrationModel:
+    """Map raw confidence to the hit rate it has historically achieved.
+
+    The model keeps per-bin hit and prediction counts for every symbol and
+    for all symbols together, plus the isotonic curves fitted from them.
+    Counts are sufficient statistics, so a refit only reads accuracy records
+    appended since the last one. Symbols with fewer than ``min_samples``
+    evaluated predictions use the global curve; others are shrunk toward it.
+    """
+
+    def __init__(self, path: Path = MODEL_PATH, log_path: Path = LOG_PATH,
+                 min_samples: int = 20, prior: float = 5.0) -> None:
+        self.path = Path(path)
+        self.log_path = Path(log_path)
+        self.min_samples = min_samples
+        self.prior = prior
+        self.offset = 0
+        self.counts: Dict[str, Dict[str, List[int]]] = {}
+        self.seen: Dict[str, List[str]] = {}
+        self.curves: Dict[str, List[float]] = {}
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH, log_path: Path = LOG_PATH) -> "CalibrationModel":
+        model = cls(path, log_path)
+        if model.path.exists():
+            try:
+                data = json.loads(model.path.read_text())
+                model.offset = int(data.get("offset", 0))
+                model.counts = data.get("counts", {})
+                model.seen = data.get("seen", {})
+                model.curves = data.get("curves", {})
+            except Exception as e:  # pragma: no cover - logging
+                logging.exception("Failed to parse calibration model: %s", e)
+                model = cls(path, log_path)
+        return model
+
+    def save(self) -> Path:
+        self.path.parent.mkdir(exist_ok=True)
+        data = {"bins": BINS, "offset": self.offset, "curves": self.curves, "counts": self.counts, "seen": self.seen}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        tmp.replace(self.path)
+        return self.path
+
+    @staticmethod
+    def _bin(confidence: float) -> int:
+        return min(max(int(confidence // (100 / BINS)), 0), BINS - 1)
+
+    def _count(self, key: str, b: int, hit: bool) -> None:
+        counts = self.counts.setdefault(key, {"hits": [0] * BINS, "totals": [0] * BINS})
+        counts["totals"][b] += 1
+        counts["hits"][b] += int(hit)
+
+    def update(self, rebuild: bool = False) -> int:
+        """Fold accuracy records appended since the last update and refit; return how many were added."""
+        if rebuild or (self.log_path.exists() and self.log_path.stat().st_size < self.offset):
+            self.offset, self.counts, self.seen = 0, {}, {}
+        if not self.log_path.exists():
+            return 0
+        seen = {date: set(symbols) for date, symbols in self.seen.items()}
+        added = 0
+        with open(self.log_path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a write in progress; pick it up next time
+                self.offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                date, symbol, hit = record.get("date"), record.get("symbol"), record.get("accuracy")
+                # Records re-appended as longer horizons mature repeat the next-day outcome.
+                if not date or not symbol or hit is None or symbol in seen.get(date, ()):
+                    continue
+                seen.setdefault(date, set()).add(symbol)
+                raw = record.get("raw_confidence")
+                b = self._bin(float(raw if raw is not None else record.get("confidence", 0)))
+                self._count(symbol, b, bool(hit))
+                self._count(GLOBAL, b, bool(hit))
+                added += 1
+        if seen:
+            cutoff = (datetime.strptime(max(seen), "%Y-%m-%d") - timedelta(days=SEEN_DAYS)).strftime("%Y-%m-%d")
+            seen = {d: s for d, s in seen.items() if d >= cutoff}
+        self.seen = {d: sorted(s) for d, s in seen.items()}
+        self.fit()
+        return added
+
+    def fit(self) -> None:
+        """Refit every curve from the stored counts."""
+        mids = [(b + 0.5) / BINS for b in range(BINS)]
+        curves: Dict[str, List[float]] = {}
+        base = self.counts.get(GLOBAL)
+        if base:
+            # Sparse global bins lean toward the identity mapping.
+            rates = [(h + self.prior * m) / (t + self.prior) for h, t, m in zip(base["hits"], base["totals"], mids)]
+            curves[GLOBAL] = isotonic(rates, [t + self.prior for t in base["totals"]])
+        anchor = curves.get(GLOBAL, mids)
+        for key, counts in self.counts.items():
+            if key == GLOBAL or sum(counts["totals"]) < self.min_samples:
+                continue
+            rates = [(h + self.prior * g) / (t + self.prior) for h, t, g in zip(counts["hits"], counts["totals"], anchor)]
+            curves[key] = isotonic(rates, [t + self.prior for t in counts["totals"]])
+        self.curves = {k: [round(r, 4) for r in v] for k, v in curves.items()}
+
+    def calibrate(self, symbol: str, confidence: float) -> float:
+        """Return the calibrated confidence percentage, interpolating between bin centres."""
+        curve = self.curves.get(symbol) or self.curves.get(GLOBAL)
+        if not curve:
+            return confidence
+        pos = min(max(confidence / (100 / BINS) - 0.5, 0.0), BINS - 1.0)
+        lo = int(pos)
+        hi = min(lo + 1, BINS - 1)
+        return (curve[lo] + (curve[hi] - curve[lo]) * (pos - lo)) * 100
+
+    def apply(self, results: List[SymbolResult]) -> None:
+        """Calibrate fresh results in place; carried-forward ones already are.
+
+        Recommendation and turnover stay on the raw confidence they were tuned for.
+        """
+        if not self.curves:
+            return
+        for result in results:
+            if result.stale or result.raw_confidence is not None:
+                continue
+            result.raw_confidence = result.confidence_value
+            result.raw_label = result.confidence_label
+            result.confidence_value = self.calibrate(result.symbol, result.confidence_value)
+            result.confidence_label = confidence_label(result.confidence_value)
+
+
+def update_calibration(rebuild: bool = False) -> Path:
+    """Refit the stored calibration model from new accuracy records and save it."""
+    model = CalibrationModel.load()
+    added = model.update(rebuild)
+    logging.info("Calibration: %d new evaluated predictions, %d curves", added, len(model.curves))
+    return model.save()
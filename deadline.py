@@ -0,0 +1,117 @@
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from records import Headline
+
+REPORT_DIR = Path("reports")
+# Fidelity levels from most to least expensive.
+FULL, REDUCED, CACHED = "full", "reduced", "cached"
+# Headlines fetched per symbol once a run falls behind.
+REDUCED_PAGE_SIZE = 2
+# Assumed cost of a reduced symbol relative to a full one until one is measured.
+REDUCED_SHARE = 0.3
+# A clock time further in the past than this is read as tomorrow's.
+ROLLOVER = timedelta(hours=12)
+
+
+def parse_deadline(value: str, now: datetime | None = None) -> float:
+    """Return the deadline ``value`` as a Unix timestamp.
+
+    ``value`` is either a local clock time (``HH:MM``) or a number of seconds
+    from now. A clock time more than ``ROLLOVER`` in the past means tomorrow;
+    one passed more recently is returned as is, so the run starts expired and
+    goes straight to the cached path.
+    """
+    now = now or datetime.now()
+    if ":" in value:
+        clock = datetime.strptime(value, "%H:%M")
+        at = now.replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+        if now - at > ROLLOVER:
+            at += timedelta(days=1)
+        elif at <= now:
+            logging.warning("Deadline %s has already passed; using cached headlines", value)
+        return at.timestamp()
+    return (now + timedelta(seconds=float(value))).timestamp()
+
+
+class Deadline:
+    """Time budget for one gather run.
+
+    Tracks the average time a symbol takes at each fidelity level and picks
+    the most expensive level that still lets every remaining symbol finish
+    before ``at``, minus a ``reserve`` share of the budget kept for writing
+    reports.
+    """
+
+    def __init__(self, at: float, reserve: float = 0.05, clock: Callable[[], float] = time.time) -> None:
+        self.at = at
+        self.clock = clock
+        self.started = clock()
+        self.reserve = max(at - self.started, 0.0) * reserve
+        self.costs: Dict[str, List[float]] = {FULL: [], REDUCED: []}
+        self._expired = False
+
+    def remaining(self) -> float:
+        return self.at - self.reserve - self.clock()
+
+    def record(self, level: str, seconds: float) -> None:
+        if level in self.costs:
+            self.costs[level].append(seconds)
+
+    def _estimate(self, level: str) -> float | None:
+        costs = self.costs[level]
+        if costs:
+            return sum(costs) / len(costs)
+        full = self.costs[FULL]
+        if level == REDUCED and full:
+            return sum(full) / len(full) * REDUCED_SHARE
+        return None
+
+    def choose(self, left: int) -> str:
+        """Return the fidelity level for the next symbol with ``left`` symbols to go."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            if not self._expired:
+                self._expired = True
+                logging.warning("Deadline expired with %d symbols left; using cached news for the rest", left)
+            return CACHED
+        for level in (FULL, REDUCED):
+            estimate = self._estimate(level)
+            # Without a measurement yet, try the level once and learn its cost.
+            if estimate is None or estimate * left <= remaining:
+                return level
+        return CACHED
+
+
+class NewsCache:
+    """Headlines per symbol from the most recent archived reports."""
+
+    def __init__(self, report_dir: Path = REPORT_DIR, history: int = 7) -> None:
+        self.report_dir = Path(report_dir)
+        self.history = history
+        self._items: Dict[str, List[Headline]] | None = None
+
+    def _load(self) -> Dict[str, List[Headline]]:
+        items: Dict[str, List[Headline]] = {}
+        for path in sorted(self.report_dir.glob("stock_report_*.json"))[-self.history:]:
+            try:
+                report = json.loads(path.read_text())
+            except Exception as e:  # pragma: no cover - logging
+                logging.exception("Failed to parse %s: %s", path, e)
+                continue
+            for result in report.get("results", []):
+                cached = result.get("items")
+                if cached is None:
+                    cached = [{"title": h} for h in result.get("headlines", [])]
+                if cached and result.get("symbol"):
+                    items[result["symbol"]] = [Headline.coerce(i) for i in cached]
+        return items
+
+    def get(self, symbol: str) -> List[Headline]:
+        if self._items is None:
+            self._items = self._load()
+        return list(self._items.get(symbol, []))
@@ -0,0 +1,171 @@
+import csv
+import json
+import logging
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+SECURITIES_MASTER = Path("data/securities_master.csv")
+DISCOVERY_STATE = Path("history/discovery_state.json")
+
+
+class Automaton:
+    """Aho-Corasick automaton matching many patterns in one pass over text."""
+
+    def __init__(self, case_sensitive: bool = False) -> None:
+        self.case_sensitive = case_sensitive
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def add(self, pattern: str, value: str) -> None:
+        if not self.case_sensitive:
+            pattern = pattern.lower()
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), value))
+
+    def build(self) -> "Automaton":
+        """Compute failure links; call once after all patterns are added."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield ``(start, end, value)`` for whole-word pattern matches in ``text``."""
+        haystack = text if self.case_sensitive else text.lower()
+        node = 0
+        for i, ch in enumerate(haystack):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                start = i - length + 1
+                if _boundary(haystack, start - 1) and _boundary(haystack, i + 1):
+                    yield start, i + 1, value
+
+
+def _boundary(text: str, idx: int) -> bool:
+    return idx < 0 or idx >= len(text) or not text[idx].isalnum()
+
+
+class SecuritiesIndex:
+    """Company names, aliases and tickers compiled into match automata."""
+
+    def __init__(self, securities: Dict[str, Dict]) -> None:
+        self.securities = securities
+        self._names = Automaton()
+        self._tickers = Automaton(case_sensitive=True)
+        for symbol, sec in securities.items():
+            for name in [sec["name"], *sec["aliases"]]:
+                if name:
+                    self._names.add(name, symbol)
+            # Bare tickers collide with ordinary words, so only the explicit
+            # "(TSLA)" and "$TSLA" forms are treated as mentions.
+            self._tickers.add(f"({symbol})", symbol)
+            self._tickers.add(f"${symbol}", symbol)
+        self._names.build()
+        self._tickers.build()
+
+    @classmethod
+    def load(cls, path: Path = SECURITIES_MASTER) -> "SecuritiesIndex":
+        """Load a CSV with ``symbol,name,aliases`` columns (aliases ``|`` separated)."""
+        securities: Dict[str, Dict] = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                symbol = (row.get("symbol") or "").strip().upper()
+                if not symbol:
+                    continue
+                aliases = [a.strip() for a in (row.get("aliases") or "").split("|") if a.strip()]
+                securities[symbol] = {"name": (row.get("name") or "").strip(), "aliases": aliases}
+        return cls(securities)
+
+    def scan(self, text: str) -> set[str]:
+        """Return the symbols mentioned in ``text``."""
+        found = {v for _, _, v in self._names.iter_matches(text)}
+        found.update(v for _, _, v in self._tickers.iter_matches(text))
+        return found
+
+    def keywords(self, symbol: str) -> List[str]:
+        sec = self.securities.get(symbol, {})
+        words = [sec.get("name", "")] + sec.get("aliases", [])
+        return [w for w in dict.fromkeys(words) if w]
+
+
+class DiscoveryEngine:
+    """Count security mentions across runs and rank candidates for the watchlist."""
+
+    def __init__(self, index: SecuritiesIndex, state_path: Path = DISCOVERY_STATE,
+                 window_days: int = 7) -> None:
+        self.index = index
+        self.state_path = Path(state_path)
+        self.window_days = window_days
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        state = {"seen": {}, "mentions": {}, "headlines": {}}
+        if self.state_path.exists():
+            try:
+                state.update(json.loads(self.state_path.read_text()))
+            except Exception as e:  # pragma: no cover - logging
+                logging.exception("Failed to parse discovery state: %s", e)
+        return state
+
+    def save(self) -> None:
+        self.state_path.parent.mkdir(exist_ok=True)
+        self.state_path.write_text(json.dumps(self.state))
+
+    def ingest(self, articles: Iterable[Dict], today: str | None = None) -> int:
+        """Scan articles not seen before and record their mentions; return how many were new."""
+        today = today or datetime.utcnow().strftime("%Y-%m-%d")
+        seen = self.state["seen"]
+        counts = Counter(self.state["mentions"].get(today, {}))
+        new = 0
+        for art in articles:
+            key = art.get("url") or art.get("title", "")
+            if not key or key in seen:
+                continue
+            seen[key] = today
+            new += 1
+            title = art.get("title", "")
+            text = f"{title} {art.get('description') or ''}"
+            for symbol in self.index.scan(text):
+                counts[symbol] += 1
+                self.state["headlines"][symbol] = title
+        self.state["mentions"][today] = dict(counts)
+        self._prune(today)
+        return new
+
+    def _prune(self, today: str) -> None:
+        cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=self.window_days - 1)).strftime("%Y-%m-%d")
+        self.state["mentions"] = {d: c for d, c in self.state["mentions"].items() if d >= cutoff}
+        self.state["seen"] = {k: d for k, d in self.state["seen"].items() if d >= cutoff}
+
+    def rank(self, exclude: Iterable[str] = (), min_mentions: int = 2, limit: int = 5) -> List[Tuple[str, int]]:
+        """Return ``(symbol, mentions)`` over the rolling window, most mentioned first."""
+        totals: Counter = Counter()
+        for counts in self.state["mentions"].values():
+            totals.update(counts)
+        skip = set(exclude)
+        ranked = [(s, n) for s, n in totals.most_common() if n >= min_mentions and s not in skip]
+        return ranked[:limit]
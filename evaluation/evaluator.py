@@ -1,9 +1,11 @@
 import os
 import json
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterator, List, Tuple
 import requests
+from records import EvaluationRecord
 from repo_utils import Committer, GitCommitter
 
 EVAL_DIR = Path('evaluations')
@@ -11,12 +13,18 @@ REPORT_DIR = Path('reports')
 HISTORY_LOG = Path('history/prediction_accuracy_log.jsonl')
 
 STOCK_API_URL = 'https://www.alphavantage.co/query'
+# Trading-day horizons checked for every prediction.
+HORIZONS = (1, 3, 5, 10)
+# Older reports revisited so their longer horizons are filled in once they mature.
+REVISIT_REPORTS = 15
 
 class Evaluator:
-    def __init__(self, stock_api_key: str | None = None, committer: Committer | None = None):
+    def __init__(self, stock_api_key: str | None = None, committer: Committer | None = None,
+                 stock_api_url: str | None = None):
         self.stock_api_key = stock_api_key or os.getenv("STOCK_API_KEY")
         if not self.stock_api_key:
             raise ValueError("STOCK_API_KEY not set")
+        self.stock_api_url = stock_api_url or os.getenv("STOCK_API_URL") or STOCK_API_URL
         EVAL_DIR.mkdir(exist_ok=True)
         HISTORY_LOG.parent.mkdir(exist_ok=True)
         repo_path = Path(__file__).resolve().parents[1]
@@ -28,79 +36,206 @@ class Evaluator:
             raise FileNotFoundError("Not enough prediction reports")
         return reports[-2]
 
-    def _fetch_actual_direction(self, symbol: str, report_date: datetime) -> str | None:
+    def _recent_reports(self, previous: Path) -> List[Path]:
+        """Return reports older than ``previous`` whose longer horizons may have matured since."""
+        reports = sorted(p for p in REPORT_DIR.glob("stock_report_*.json") if p.name < previous.name)
+        return reports[-REVISIT_REPORTS:]
+
+    def _fetch_series(self, symbol: str) -> List[Tuple[str, float]]:
+        """Return ``(date, close)`` pairs in ascending date order."""
         params = {
             "function": "TIME_SERIES_DAILY_ADJUSTED",
             "symbol": symbol,
             "apikey": self.stock_api_key,
         }
         try:
-            resp = requests.get(STOCK_API_URL, params=params, timeout=10)
+            resp = requests.get(self.stock_api_url, params=params, timeout=10)
             resp.raise_for_status()
             data = resp.json()
         except Exception:
-            return None
-
-        series = data.get("Time Series (Daily)", {})
-        next_day = (report_date + timedelta(days=1)).strftime("%Y-%m-%d")
-        prev_str = report_date.strftime("%Y-%m-%d")
-        closing_next = series.get(next_day, {}).get("4. close")
-        closing_prev = series.get(prev_str, {}).get("4. close")
-        if not closing_next or not closing_prev:
-            return None
-        try:
-            next_val = float(closing_next)
-            prev_val = float(closing_prev)
-        except ValueError:
-            return None
-        if next_val > prev_val:
-            return "up"
-        if next_val < prev_val:
-            return "down"
-        return "neutral"
-
-    def _append_history(self, record: Dict[str, object]) -> None:
-        line = json.dumps(record)
+            return []
+
+        series = []
+        for day, values in data.get("Time Series (Daily)", {}).items():
+            try:
+                series.append((day, float(values.get("4. close"))))
+            except (TypeError, ValueError):
+                continue
+        series.sort()
+        return series
+
+    def _horizon_outcomes(self, series: List[Tuple[str, float]], report_date: datetime,
+                          horizons: Tuple[int, ...] = HORIZONS) -> Dict[str, Dict | None]:
+        """Return realized direction and return ``h`` trading days after ``report_date``.
+
+        The base close is the last close on or before the report date, so
+        reports made on weekends and holidays are measured from the previous
+        session. Horizons not yet in the series map to ``None``.
+        """
+        outcomes: Dict[str, Dict | None] = {str(h): None for h in horizons}
+        dates = [d for d, _ in series]
+        base = bisect_right(dates, report_date.strftime("%Y-%m-%d")) - 1
+        if base < 0:
+            return outcomes
+        base_close = series[base][1]
+        for h in horizons:
+            if base + h >= len(series) or not base_close:
+                continue
+            close = series[base + h][1]
+            direction = "up" if close > base_close else "down" if close < base_close else "neutral"
+            outcomes[str(h)] = {"direction": direction, "return": round(close / base_close - 1, 6)}
+        return outcomes
+
+    def _fetch_actual_direction(self, symbol: str, report_date: datetime) -> str | None:
+        """Return the direction over the next trading day."""
+        outcome = self._horizon_outcomes(self._fetch_series(symbol), report_date, (1,))["1"]
+        return outcome["direction"] if outcome else None
+
+    def _append_history(self, record: EvaluationRecord) -> None:
+        line = json.dumps(record.to_dict())
         with open(HISTORY_LOG, "a") as f:
             f.write(line + "\n")
 
+    def _matured_horizons(self, pending: set) -> Dict[Tuple[str, str], set]:
+        """Return the horizons already recorded for the ``pending`` ``(date, symbol)`` pairs.
+
+        The log is read from the end. A report's records are only written
+        while it is among the ``REVISIT_REPORTS + 1`` reports before the newest,
+        so reading stops at the first record of a report too old to have been
+        logged after any pending one.
+        """
+        matured: Dict[Tuple[str, str], set] = {}
+        if not pending or not HISTORY_LOG.exists():
+            return matured
+        positions = {p.name[len("stock_report_"):-len(".json")]: i
+                     for i, p in enumerate(sorted(REPORT_DIR.glob("stock_report_*.json")))}
+        oldest = positions.get(min(d for d, _ in pending))
+        for line in _reverse_lines(HISTORY_LOG):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            key = (record.get("date"), record.get("symbol"))
+            position = positions.get(key[0])
+            if oldest is not None and position is not None and position < oldest - REVISIT_REPORTS:
+                break
+            if key in pending and key not in matured:
+                horizons = record.get("horizons") or {}
+                matured[key] = {h for h, v in horizons.items() if v}
+        return matured
+
+    def _record(self, report_date: str, pred: Dict, outcomes: Dict[str, Dict | None]) -> EvaluationRecord:
+        predicted_direction = pred.get("prediction", {}).get("direction")
+        conf = pred.get("prediction", {}).get("confidence", {}).get("value", 0)
+        raw = pred.get("prediction", {}).get("confidence", {}).get("raw")
+        horizons = {
+            h: dict(o, accuracy=o["direction"] == predicted_direction) if o else None
+            for h, o in outcomes.items()
+        }
+        next_day = horizons.get("1")
+        return EvaluationRecord(
+            date=report_date,
+            symbol=pred.get("symbol"),
+            predicted_direction=predicted_direction,
+            actual_direction=next_day["direction"] if next_day else "unknown",
+            confidence=round(conf),
+            accuracy=next_day["accuracy"] if next_day else None,
+            horizons=horizons,
+            raw_confidence=round(raw) if raw is not None else None,
+        )
+
     def evaluate(self, symbols: List[str], commit: bool = True) -> Path:
+        """Evaluate the previous report and refresh matured horizons of older ones.
+
+        One price series is fetched per symbol and reused for every report.
+        Records for older reports are appended again only when a horizon has
+        matured since they were last logged; readers keep the latest record per
+        date and symbol.
+        """
         report_path = self._previous_report()
         report = json.loads(report_path.read_text())
-        report_date = datetime.strptime(report.get("date"), "%Y-%m-%d")
+        older = [json.loads(p.read_text()) for p in self._recent_reports(report_path)]
+        matured = self._matured_horizons({
+            (o.get("date"), r.get("symbol")) for o in older for r in _fresh_results(o) if r.get("symbol") in symbols
+        })
 
         evaluations = []
+        updates = []
         for symbol in symbols:
-            pred = next((r for r in report.get("results", []) if r.get("symbol") == symbol), None)
-            if not pred:
+            pred = next((r for r in _fresh_results(report) if r.get("symbol") == symbol), None)
+            past = [(o.get("date"), r) for o in older for r in _fresh_results(o) if r.get("symbol") == symbol]
+            if not pred and not past:
                 continue
-            predicted_direction = pred.get("prediction", {}).get("direction")
-            conf = pred.get("prediction", {}).get("confidence", {}).get("value", 0)
-            actual_direction = self._fetch_actual_direction(symbol, report_date)
-            accuracy = (actual_direction == predicted_direction) if actual_direction else None
-            record = {
-                "date": report.get("date"),
-                "symbol": symbol,
-                "predicted_direction": predicted_direction,
-                "actual_direction": actual_direction or "unknown",
-                "confidence": round(conf),
-                "accuracy": accuracy,
-            }
-            self._append_history(record)
-            evaluations.append(record)
+            series = self._fetch_series(symbol)
+            if pred:
+                report_date = datetime.strptime(report.get("date"), "%Y-%m-%d")
+                record = self._record(report.get("date"), pred, self._horizon_outcomes(series, report_date))
+                self._append_history(record)
+                evaluations.append(record)
+            for date_str, past_pred in past:
+                outcomes = self._horizon_outcomes(series, datetime.strptime(date_str, "%Y-%m-%d"))
+                known = matured.get((date_str, symbol), set())
+                if {h for h, o in outcomes.items() if o} - known:
+                    record = self._record(date_str, past_pred, outcomes)
+                    self._append_history(record)
+                    updates.append(record)
 
         eval_date = datetime.utcnow().strftime("%Y-%m-%d")
         filename = EVAL_DIR / f"evaluation-{eval_date}.md"
         lines = [f"# Evaluation - {eval_date}", f"Report evaluated: {report_path.name}"]
         for ev in evaluations:
             lines.append("")
-            lines.append(f"Symbol: {ev['symbol']}")
-            lines.append(f"Predicted direction: {ev['predicted_direction']}")
-            lines.append(f"Actual direction: {ev['actual_direction']}")
-            lines.append(f"Confidence: {ev['confidence']}")
-            lines.append(f"Accuracy: {ev['accuracy']}")
+            lines.append(f"Symbol: {ev.symbol}")
+            lines.append(f"Predicted direction: {ev.predicted_direction}")
+            lines.append(f"Actual direction: {ev.actual_direction}")
+            lines.append(f"Confidence: {ev.confidence}")
+            lines.append(f"Accuracy: {ev.accuracy}")
+            lines.append(f"Horizons: {_format_horizons(ev.horizons)}")
+        if updates:
+            lines.append("")
+            lines.append("## Matured horizons from earlier reports")
+            for ev in updates:
+                lines.append(f"- {ev.date} {ev.symbol} ({ev.predicted_direction}): {_format_horizons(ev.horizons)}")
         filename.write_text("\n".join(lines))
         if commit:
             self.committer.add_and_commit(filename, f"Add evaluation report for {eval_date}")
             self.committer.add_and_commit(HISTORY_LOG, "Update accuracy history")
         return filename
+
+
+def _fresh_results(report: Dict) -> List[Dict]:
+    """Return the results made in ``report``'s run.
+
+    Predictions carried forward as stale were already evaluated under the date they were made.
+    """
+    return [r for r in report.get("results", []) if not r.get("stale")]
+
+
+def _reverse_lines(path: Path, block: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield the lines of ``path`` from last to first, reading ``block`` bytes at a time."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        tail = b""
+        while end > 0:
+            start = max(end - block, 0)
+            f.seek(start)
+            chunk = f.read(end - start) + tail
+            end = start
+            lines = chunk.split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+def _format_horizons(horizons: Dict[str, Dict | None]) -> str:
+    parts = []
+    for h, o in horizons.items():
+        if o:
+            parts.append(f"{h}d {o['direction']} {o['return'] * 100:+.2f}% ({'hit' if o['accuracy'] else 'miss'})")
+        else:
+            parts.append(f"{h}d pending")
+    return ", ".join(parts)
@@ -0,0 +1,99 @@
+import hashlib
+import re
+from collections import defaultdict
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+from records import Headline
+
+STOPWORDS = {"a", "an", "the", "of", "to", "in", "on", "for", "and", "as", "at", "by", "is", "its", "with"}
+# Wording that syndicated copies swap freely.
+SYNONYMS = {"share": "stock", "stocks": "stock", "shares": "stock"}
+
+_PRIME = (1 << 61) - 1
+_SEEDS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _PRIME | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _PRIME)
+    for i in range(16)
+]
+
+
+def tokens(title: str) -> frozenset:
+    """Return the normalized word set used to compare headlines."""
+    out = set()
+    for word in re.findall(r"[a-z0-9]+", title.lower()):
+        if word in STOPWORDS:
+            continue
+        word = SYNONYMS.get(word, word)
+        if len(word) > 3 and word.endswith("s"):
+            word = word[:-1]
+        out.add(word)
+    return frozenset(out)
+
+
+def minhash(words: frozenset) -> Tuple[int, ...]:
+    hashes = [int.from_bytes(hashlib.blake2b(w.encode(), digest_size=8).digest(), "big") for w in words]
+    if not hashes:
+        return tuple([_PRIME] * len(_SEEDS))
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _SEEDS)
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index for finding headlines that are near copies of earlier ones.
+
+    Signatures are split into bands; headlines sharing any band become
+    candidates and are confirmed with exact Jaccard similarity, so each lookup
+    only compares against a handful of earlier headlines.
+    """
+
+    def __init__(self, threshold: float = 0.6, bands: int = 8) -> None:
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = len(_SEEDS) // bands
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        self._tokens: List[frozenset] = []
+
+    def _keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [(b, signature[b * self.rows:(b + 1) * self.rows]) for b in range(self.bands)]
+
+    def add(self, title: str) -> int:
+        """Return the id of an earlier near duplicate of ``title`` or index it under a new id."""
+        words = tokens(title)
+        keys = self._keys(minhash(words))
+        seen = set()
+        for key in keys:
+            for cand in self._buckets.get(key, ()):
+                if cand in seen:
+                    continue
+                seen.add(cand)
+                if jaccard(words, self._tokens[cand]) >= self.threshold:
+                    return cand
+        new_id = len(self._tokens)
+        self._tokens.append(words)
+        for key in keys:
+            self._buckets[key].append(new_id)
+        return new_id
+
+
+def collapse_near_duplicates(items: List[Headline], threshold: float = 0.6) -> List[Headline]:
+    """Collapse near-duplicate headlines into one representative per cluster.
+
+    The first item of each cluster is kept (matched headlines arrive sorted by
+    relevance) and carries ``cluster_size`` so downstream scoring can still
+    weight the story by how widely it was syndicated.
+    """
+    index = NearDuplicateIndex(threshold)
+    reps: Dict[int, Headline] = {}
+    for item in items:
+        cid = index.add(item.title)
+        if cid in reps:
+            reps[cid].cluster_size += item.cluster_size
+        else:
+            reps[cid] = replace(item)
+    return list(reps.values())
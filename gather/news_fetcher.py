@@ -1,23 +1,120 @@
+import codecs
+import json
 import os
 import requests
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List
 
 NEWS_API_URL = 'https://newsapi.org/v2/everything'
+# Largest pageSize NewsAPI accepts.
+MAX_PAGE_SIZE = 100
+# Bytes read from the response per step while streaming articles.
+CHUNK_SIZE = 16 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+def _skip_ws(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in ' \t\r\n':
+        pos += 1
+    return pos
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str, meta: Dict | None = None) -> Iterator:
+    """Yield the elements of the top-level ``key`` array of a JSON object as they arrive.
+
+    Only the unparsed tail of the body is buffered, so memory stays at about
+    one element plus one chunk however long the array is. Other top-level
+    values are stored in ``meta`` when given. Raises ``json.JSONDecodeError``
+    if the body ends before the object is closed.
+    """
+    text = codecs.getincrementaldecoder('utf-8')()
+    buf, pos = '', 0
+    state = 'start'  # start -> key -> colon -> value | array -> after_item
+    current = None
+    for chunk in chunks:
+        buf = buf[pos:] + text.decode(chunk)
+        pos = 0
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos >= len(buf):
+                break
+            ch = buf[pos]
+            if state == 'start':
+                if ch != '{':
+                    raise ValueError('Expected a JSON object')
+                pos += 1
+                state = 'key'
+            elif state == 'key':
+                if ch == '}':
+                    return
+                if ch == ',':
+                    pos += 1
+                    continue
+                try:
+                    current, pos = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break  # the key is split across chunks
+                state = 'colon'
+            elif state == 'colon':
+                if ch != ':':
+                    raise ValueError('Expected ":" after object key')
+                pos += 1
+                state = 'value'
+            elif state == 'value':
+                if current == key and ch == '[':
+                    pos += 1
+                    state = 'array'
+                    continue
+                try:
+                    value, end = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break
+                # A scalar at the very end of the buffer may still be growing.
+                if _skip_ws(buf, end) >= len(buf):
+                    break
+                if meta is not None:
+                    meta[current] = value
+                pos = end
+                state = 'key'
+            elif state in ('array', 'after_item'):
+                if ch == ']':
+                    return
+                if ch == ',' and state == 'after_item':
+                    pos += 1
+                    state = 'array'
+                    continue
+                try:
+                    item, pos = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break
+                state = 'after_item'
+                yield item
+    buf = buf[pos:] + text.decode(b'', final=True)
+    raise json.JSONDecodeError('Response ended before the JSON object was complete', buf, len(buf))
+
 
 class NewsFetcher:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, base_url: str | None = None):
         self.api_key = api_key or os.getenv('NEWS_API_KEY')
         if not self.api_key:
             raise ValueError('NEWS_API_KEY not set')
+        self.base_url = base_url or os.getenv('NEWS_API_URL') or NEWS_API_URL
 
-    def fetch(self, query: str, page_size: int = 5) -> List[Dict]:
+    def iter_articles(self, query: str, page_size: int = 5, meta: Dict | None = None) -> Iterator[Dict]:
+        """Yield articles one at a time while the response is still downloading.
+
+        Response fields other than the articles, such as ``totalResults``, are
+        stored in ``meta`` when given.
+        """
         params = {
             'q': query,
             'language': 'en',
             'pageSize': page_size,
             'apiKey': self.api_key,
         }
-        response = requests.get(NEWS_API_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        return data.get('articles', [])
+        with requests.get(self.base_url, params=params, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_json_array(response.iter_content(CHUNK_SIZE), 'articles', meta)
+
+    def fetch(self, query: str, page_size: int = 5) -> List[Dict]:
+        return list(self.iter_articles(query, page_size))
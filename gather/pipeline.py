@@ -0,0 +1,149 @@
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+from calibration import CalibrationModel
+from deadline import CACHED, FULL, REDUCED, REDUCED_PAGE_SIZE, Deadline, NewsCache
+from gather.dedup import collapse_near_duplicates
+from gather.news_fetcher import MAX_PAGE_SIZE, NewsFetcher
+from gather.sentiment_analyzer import SentimentAnalyzer
+from records import Headline
+from relevance_matcher import RelevanceMatcher
+from run_model import SymbolResult
+
+# Articles fetched per headline kept, so relevance ranking has candidates to drop.
+FETCH_WINDOW = 4
+
+
+def build_result(analyzer: SentimentAnalyzer, symbol: str, company: str,
+                 analyzed: List[Headline], now: datetime | None = None) -> SymbolResult:
+    """Turn analyzed headlines into a scored prediction for ``symbol`` as of ``now``."""
+    scored = [i for i in analyzed if i.sentiment is not None]
+    weighted = analyzer.weighted_score(scored, now)
+    confidence = analyzer.confidence(scored)
+    direction = "up" if weighted > 0 else "down" if weighted < 0 else "neutral"
+    return SymbolResult(
+        symbol=symbol,
+        company=company,
+        items=analyzed,
+        score=weighted,
+        direction=direction,
+        confidence_value=confidence[0],
+        confidence_label=confidence[1],
+    )
+
+
+class SymbolPipeline:
+    """Fetch, match and score news for watchlist entries."""
+
+    def __init__(self, entries: List[Dict], query: str = "stock market") -> None:
+        self.query = query
+        self.fetcher = NewsFetcher()
+        self.matcher = RelevanceMatcher(keyword_map={e["symbol"]: e.get("keywords", []) for e in entries})
+        self.analyzer = SentimentAnalyzer()
+        self.news_cache = NewsCache()
+        self.calibration = CalibrationModel.load()
+        # NewsAPI ``totalResults`` per symbol fetched in the current run.
+        self.news_volume: Dict[str, int] = {}
+
+    def _matched(self, entry: Dict, page_size: int = 5) -> List[Headline]:
+        symbol = entry["symbol"]
+        logging.info("Processing %s", symbol)
+        # One request returns up to FETCH_WINDOW times more articles than are
+        # kept; they are matched as they stream in and only the ``page_size``
+        # most relevant survive, so memory stays bounded by ``page_size``.
+        window = min(page_size * FETCH_WINDOW, MAX_PAGE_SIZE)
+        meta: Dict = {}
+        try:
+            articles = self.fetcher.iter_articles(f"{symbol} {self.query}", page_size=window, meta=meta)
+            matched = self.matcher.match_headlines(articles, symbol, limit=page_size)
+        except Exception as e:
+            logging.exception("Failed to fetch news for %s: %s", symbol, e)
+            matched = []
+        if isinstance(meta.get("totalResults"), int):
+            self.news_volume[symbol] = meta["totalResults"]
+        return collapse_near_duplicates(matched)
+
+    def _result(self, entry: Dict, analyzed: List[Headline]) -> SymbolResult:
+        result = build_result(self.analyzer, entry["symbol"], (entry.get("keywords") or [""])[0], analyzed)
+        result.news_volume = self.news_volume.pop(entry["symbol"], None)
+        return result
+
+    def run(self, entry: Dict) -> SymbolResult:
+        return self.run_many([entry])[0]
+
+    def _cached(self, symbol: str) -> List[Headline]:
+        return self.matcher.fill_relevance(self.news_cache.get(symbol), symbol)
+
+    def run_many(self, entries: List[Dict], page_sizes: Dict[str, int] | None = None,
+                 llm_limits: Dict[str, int] | None = None, deadline: Deadline | None = None) -> List[SymbolResult]:
+        """Fetch and match every entry, then score all headlines as one batch.
+
+        ``page_sizes`` and ``llm_limits`` override fetch depth and LLM calls per symbol.
+        With a ``deadline``, symbols are processed one at a time and degraded as needed.
+        Confidence values are calibrated against the accuracy history.
+        """
+        page_sizes = page_sizes or {}
+        if deadline is not None:
+            results = self._run_paced(entries, page_sizes, llm_limits, deadline)
+        else:
+            results = self._run_batch(entries, page_sizes, llm_limits)
+        self.calibration.apply(results)
+        return results
+
+    def _run_batch(self, entries: List[Dict], page_sizes: Dict[str, int],
+                   llm_limits: Dict[str, int] | None) -> List[SymbolResult]:
+        matched = [self._matched(entry, page_sizes.get(entry["symbol"], 5)) for entry in entries]
+        limits = [llm_limits[e["symbol"]] for e in entries] if llm_limits is not None else None
+        try:
+            analyzed = self.analyzer.analyze_many(matched, limits)
+        except Exception as e:
+            logging.exception("Sentiment analysis failed: %s", e)
+            analyzed = matched
+        logging.info(
+            "Sentiment: %d headlines, %d scored locally, %d sent to the LLM",
+            self.analyzer.stats["headlines"], self.analyzer.stats["local"], self.analyzer.stats["escalated"],
+        )
+        return [self._result(entry, group) for entry, group in zip(entries, analyzed)]
+
+    def _run_paced(self, entries: List[Dict], page_sizes: Dict[str, int],
+                   llm_limits: Dict[str, int] | None, deadline: Deadline) -> List[SymbolResult]:
+        """Score entries in order, falling back to cheaper paths when behind schedule.
+
+        ``reduced`` symbols fetch at most ``REDUCED_PAGE_SIZE`` headlines and are
+        scored locally; ``cached`` symbols reuse headlines from the latest report
+        without calling any API. Both are marked with their fidelity.
+        """
+        results = []
+        for done, entry in enumerate(entries):
+            symbol = entry["symbol"]
+            level = deadline.choose(len(entries) - done)
+            start = deadline.clock()
+            page_size = page_sizes.get(symbol, 5)
+            limit = llm_limits[symbol] if llm_limits is not None else None
+            if level == FULL:
+                items = self._matched(entry, page_size)
+            elif level == REDUCED:
+                items = self._matched(entry, min(page_size, REDUCED_PAGE_SIZE))
+                limit = 0
+            elif level == CACHED:
+                items = self._cached(symbol)
+                limit = 0
+            else:
+                raise ValueError(f"Unknown fidelity level {level!r}")
+            try:
+                analyzed = self.analyzer.analyze_many([items], None if limit is None else [limit])[0]
+            except Exception as e:
+                logging.exception("Sentiment analysis failed for %s: %s", symbol, e)
+                analyzed = items
+            result = self._result(entry, analyzed)
+            result.fidelity = level
+            results.append(result)
+            deadline.record(level, deadline.clock() - start)
+
+        degraded = [r.symbol for r in results if r.fidelity != FULL]
+        logging.info(
+            "Deadline: %d of %d symbols at reduced fidelity, %.0fs to spare",
+            len(degraded), len(results), deadline.at - deadline.clock(),
+        )
+        return results
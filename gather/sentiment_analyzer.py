@@ -1,84 +1,181 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Dict, Tuple
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 
 import openai
 from textblob import TextBlob
 from dateutil import parser
 
+from records import Headline
+
 
 class SentimentAnalyzer:
-    """Perform sentiment analysis and compute weighted scores."""
+    """Perform sentiment analysis and compute weighted scores.
+
+    In cascade mode (``cascade=True`` or ``SENTIMENT_CASCADE=1``) headlines are
+    scored locally with TextBlob first. A headline goes to the LLM only when
+    its local polarity is within ``escalate_below`` of zero, or when it carries
+    at least ``escalate_share`` of its symbol's relevance weight. The share rule
+    only applies to groups of at least ``escalate_min_group`` headlines, since
+    in smaller groups some headline always carries a large share.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, max_in_flight: int | None = None, cascade: bool | None = None,
+                 escalate_below: float | None = None, escalate_share: float | None = None,
+                 escalate_min_group: int | None = None) -> None:
         self.api_key = os.getenv("OPENAI_API_KEY")
+        self.client = None
         if self.api_key:
-            openai.api_key = self.api_key
+            self.client = openai.OpenAI(api_key=self.api_key, base_url=os.getenv("OPENAI_API_BASE") or None)
+        self.max_in_flight = max_in_flight or int(os.getenv("SENTIMENT_CONCURRENCY", "8"))
+        if cascade is None:
+            cascade = os.getenv("SENTIMENT_CASCADE", "") not in ("", "0")
+        self.cascade = cascade
+        self.escalate_below = escalate_below if escalate_below is not None else float(
+            os.getenv("SENTIMENT_ESCALATE_BELOW", "0.15"))
+        self.escalate_share = escalate_share if escalate_share is not None else float(
+            os.getenv("SENTIMENT_ESCALATE_SHARE", "0.5"))
+        self.escalate_min_group = escalate_min_group if escalate_min_group is not None else int(
+            os.getenv("SENTIMENT_ESCALATE_MIN_GROUP", "3"))
+        self.stats = {"headlines": 0, "local": 0, "escalated": 0}
+
+    def _llm_polarity(self, title: str) -> float:
+        resp = self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "Return a sentiment polarity score between -1 and 1."},
+                {"role": "user", "content": title},
+            ],
+            temperature=0,
+        )
+        return float(resp.choices[0].message.content.strip())
+
+    def _polarity(self, title: str) -> float | None:
+        """Return the LLM polarity of ``title``, or ``None`` if the request failed."""
+        try:
+            return self._llm_polarity(title)
+        except Exception as e:
+            logging.exception("OpenAI sentiment failed: %s", e)
+            return None
+
+    def _score_titles(self, titles: List[str]) -> Dict[str, float]:
+        """Score each distinct title once, keeping up to ``max_in_flight`` LLM requests open.
 
-    def analyze(self, items: List[Dict]) -> List[Dict]:
+        Only titles the LLM actually scored are returned; callers score the rest locally.
+        """
+        unique = list(dict.fromkeys(titles))
+        if not self.api_key or not unique:
+            return {}
+        if self.max_in_flight <= 1 or len(unique) <= 1:
+            polarities = [self._polarity(t) for t in unique]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(unique))) as pool:
+                polarities = list(pool.map(self._polarity, unique))
+        return {t: p for t, p in zip(unique, polarities) if p is not None}
+
+    def _escalated(self, groups: List[List[Headline]], local: Dict[str, float]) -> List[List[str]]:
+        """Return, per group, the titles the cascade sends to the LLM."""
+        chosen = []
+        for group in groups:
+            weights = [i.relevance_score * i.cluster_size for i in group]
+            total = sum(weights) if len(group) >= self.escalate_min_group else 0.0
+            chosen.append([
+                item.title for item, weight in zip(group, weights)
+                if abs(local[item.title]) < self.escalate_below
+                or (weight / total if total else 0.0) >= self.escalate_share
+            ])
+        return chosen
+
+    def analyze(self, items: List[Headline | Dict]) -> List[Headline]:
         """Return sentiment info for each relevant news item."""
-        results: List[Dict] = []
-        for item in items:
-            title = item.get("title", "")
-            polarity = 0.0
-            if self.api_key:
-                try:
-                    resp = openai.ChatCompletion.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": "Return a sentiment polarity score between -1 and 1."},
-                            {"role": "user", "content": title},
-                        ],
-                        temperature=0,
-                    )
-                    polarity = float(resp.choices[0].message.content.strip())
-                except Exception as e:
-                    logging.exception("OpenAI sentiment failed: %s", e)
-                    polarity = TextBlob(title).sentiment.polarity
-            else:
-                polarity = TextBlob(title).sentiment.polarity
-            results.append({
-                "title": title,
-                "sentiment": float(polarity),
-                "relevance_score": float(item.get("relevance_score", 0.0)),
-                "keyword": item.get("keyword", ""),
-                "publishedAt": item.get("publishedAt"),
-            })
-        return results
-
-    def weighted_score(self, items: List[Dict]) -> float:
-        """Compute relevance and recency weighted sentiment score."""
-        now = datetime.utcnow()
+        return self.analyze_many([items])[0]
+
+    def analyze_many(self, groups: List[List[Headline | Dict]],
+                     llm_limits: List[int] | None = None) -> List[List[Headline]]:
+        """Analyze several item lists (e.g. one per symbol) as one concurrent batch.
+
+        Results keep the input order; identical titles are sent to the LLM once.
+        ``llm_limits`` caps how many titles of each group may use the LLM; the
+        rest are scored locally.
+        """
+        groups = [[Headline.coerce(item) for item in group] for group in groups]
+        titles = list(dict.fromkeys(item.title for group in groups for item in group))
+        if not self.api_key:
+            scores = {t: TextBlob(t).sentiment.polarity for t in titles}
+            self.stats["headlines"] += len(scores)
+            self.stats["local"] += len(scores)
+            return [[replace(item, sentiment=float(scores[item.title])) for item in group] for group in groups]
+
+        local: Dict[str, float] = {}
+        if self.cascade:
+            local = {t: TextBlob(t).sentiment.polarity for t in titles}
+            candidates = self._escalated(groups, local)
+        else:
+            candidates = [[item.title for item in group] for group in groups]
+        if llm_limits is not None:
+            candidates = [group[:limit] for group, limit in zip(candidates, llm_limits)]
+        escalate = list(dict.fromkeys(t for group in candidates for t in group))
+
+        scores = self._score_titles(escalate)
+        # Titles whose LLM request failed were scored locally and count as such.
+        answered = len(scores)
+        for t in titles:
+            if t not in scores:
+                scores[t] = local[t] if t in local else TextBlob(t).sentiment.polarity
+        self.stats["headlines"] += len(scores)
+        self.stats["local"] += len(scores) - answered
+        self.stats["escalated"] += answered
+        return [[replace(item, sentiment=float(scores[item.title])) for item in group] for group in groups]
+
+    def weighted_score(self, items: List[Headline | Dict], now: datetime | None = None) -> float:
+        """Compute relevance, recency and cluster-size weighted sentiment score.
+
+        Recency is measured back from ``now`` (naive UTC, default the current time).
+        """
+        now = now or datetime.utcnow()
         total = 0.0
         weight_sum = 0.0
-        for item in items:
-            relevance = float(item.get("relevance_score", 0.0))
-            ts = item.get("publishedAt")
+        for item in map(Headline.coerce, items):
+            ts = item.published_at
             recency = 1.0
             if ts:
                 try:
                     dt = parser.parse(ts)
+                    if dt.tzinfo is not None:
+                        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
                     days = (now - dt).total_seconds() / 86400.0
                     recency = max(0.5, 1 - days / 7)
                 except Exception:
                     recency = 1.0
-            weight = relevance * recency
-            total += float(item.get("sentiment", 0.0)) * weight
+            weight = item.relevance_score * recency * item.cluster_size
+            total += (item.sentiment or 0.0) * weight
             weight_sum += weight
         return total / weight_sum if weight_sum else 0.0
 
-    def confidence(self, items: List[Dict]) -> Tuple[float, str]:
+    def confidence(self, items: List[Headline | Dict]) -> Tuple[float, str]:
         """Return confidence percentage and label."""
         if not items:
             return 0.0, "Low"
+        items = [Headline.coerce(i) for i in items]
         n = len(items)
-        avg_rel = sum(i.get("relevance_score", 0.0) for i in items) / n
-        avg_abs_sent = sum(abs(i.get("sentiment", 0.0)) for i in items) / n
-        volume = min(n / 5.0, 1.0)
-        score = (avg_rel * 0.4 + avg_abs_sent * 0.4 + volume * 0.2) * 100
-        label = "High" if score > 66 else "Medium" if score > 33 else "Low"
-        return score, label
+        avg_rel = sum(i.relevance_score for i in items) / n
+        avg_abs_sent = sum(abs(i.sentiment or 0.0) for i in items) / n
+        articles = sum(i.cluster_size for i in items)
+        return confidence_from(avg_rel, avg_abs_sent, articles)
+
+
+def confidence_from(avg_rel: float, avg_abs_sent: float, articles: float) -> Tuple[float, str]:
+    """Return confidence percentage and label from aggregate headline statistics."""
+    volume = min(articles / 5.0, 1.0)
+    score = (avg_rel * 0.4 + avg_abs_sent * 0.4 + volume * 0.2) * 100
+    return score, confidence_label(score)
+
+
+def confidence_label(score: float) -> str:
+    return "High" if score > 66 else "Medium" if score > 33 else "Low"
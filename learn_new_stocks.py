@@ -1,59 +1,45 @@
 import logging
 from pathlib import Path
-from typing import List, Dict
-
+from discovery import DiscoveryEngine, SecuritiesIndex, SECURITIES_MASTER
 from gather.news_fetcher import NewsFetcher
-from watchlist import WatchlistManager
+from watchlist import WatchlistStore
 
 WATCHLIST_PATH = Path("watchlist.json")
 
 
-def load_watchlist(path: Path = WATCHLIST_PATH) -> List[Dict]:
-    return WatchlistManager(path).load()
-
-
-def save_watchlist(data: List[Dict], path: Path = WATCHLIST_PATH) -> None:
-    WatchlistManager(path).save(data)
+def learn_new_stocks(query: str = "stock market", master_path: Path = SECURITIES_MASTER,
+                     min_mentions: int = 2, max_new: int = 5) -> None:
+    """Discover new stocks from recent news and extend the watchlist.
 
-
-def learn_new_stocks(query: str = "stock market") -> None:
-    """Discover new stocks from recent news headlines and extend the watchlist."""
+    Only articles not seen by earlier runs are scanned. Symbols are added once
+    their mentions over the rolling window reach ``min_mentions``.
+    """
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
-    watchlist = load_watchlist()
-    known = {item.get("symbol") for item in watchlist}
+    store = WatchlistStore(seed=WATCHLIST_PATH)
+    known = store.symbols()
+    index = SecuritiesIndex.load(master_path)
+    engine = DiscoveryEngine(index)
     fetcher = NewsFetcher()
-    articles = fetcher.fetch(query, page_size=20)
-
-    mapping: Dict[str, tuple[str, List[str]]] = {
-        "Broadcom": ("AVGO", ["Broadcom", "VMware"]),
-        "Adobe": ("ADBE", ["Adobe", "Photoshop"]),
-        "Qualcomm": ("QCOM", ["Qualcomm", "Snapdragon"]),
-        "Samsung": ("SSNLF", ["Samsung", "Galaxy"]),
-        "Spotify": ("SPOT", ["Spotify"]),
-        "Intel": ("INTC", ["Intel", "processor"]),
-    }
+    articles = fetcher.fetch(query, page_size=100)
+    new_articles = engine.ingest(articles)
+    engine.save()
+    logging.info("Scanned %d new of %d fetched articles", new_articles, len(articles))
 
     added = []
-    for art in articles:
-        title = art.get("title", "")
-        for name, (symbol, keywords) in mapping.items():
-            if symbol in known:
-                continue
-            if name.lower() in title.lower():
-                watchlist.append({
-                    "symbol": symbol,
-                    "keywords": keywords,
-                    "discovered": True,
-                    "discovery_headline": title,
-                })
-                known.add(symbol)
-                added.append(symbol)
-                logging.info("Discovered new stock %s from headline: %s", symbol, title)
-                break
+    for symbol, mentions in engine.rank(exclude=known, min_mentions=min_mentions, limit=max_new):
+        headline = engine.state["headlines"].get(symbol, "")
+        store.upsert({
+            "symbol": symbol,
+            "keywords": index.keywords(symbol),
+            "discovered": True,
+            "discovery_headline": headline,
+        })
+        added.append(symbol)
+        logging.info("Discovered new stock %s (%d mentions) from headline: %s", symbol, mentions, headline)
 
     if added:
-        save_watchlist(watchlist)
+        store.export_json()
         print("Added new stocks:", ", ".join(added))
     else:
         print("No new stocks discovered.")
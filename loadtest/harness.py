@@ -0,0 +1,203 @@
+"""End-to-end load test of the forecast flow against local stub APIs.
+
+Run with ``python -m loadtest.harness --sizes 10,50,200``. Each size builds a
+synthetic watchlist in a scratch directory, then times gathering, report
+writing and evaluation with every API call served by the stubs in
+``loadtest.stubs``. Nothing is committed and no real quota is used.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from loadtest.stubs import AlphaVantageStub, NewsApiStub, OpenAIStub, StubConfig, StubServer
+
+
+class NullCommitter:
+    """Committer that records nothing."""
+
+    def add_and_commit(self, path: Path, message: str) -> None:
+        pass
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def _timed(fn, latencies: List[float]):
+    def wrapper(*args, **kwargs):
+        start = time.monotonic()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            latencies.append(time.monotonic() - start)
+    return wrapper
+
+
+def _timed_iter(fn, latencies: List[float]):
+    """Like ``_timed`` for generator functions: time until the iterator is exhausted."""
+    def wrapper(*args, **kwargs):
+        start = time.monotonic()
+        try:
+            yield from fn(*args, **kwargs)
+        finally:
+            latencies.append(time.monotonic() - start)
+    return wrapper
+
+
+@contextmanager
+def _scratch(env: Dict[str, str]) -> Iterator[Path]:
+    """Run inside a temporary working directory with ``env`` applied."""
+    saved = {k: os.environ.get(k) for k in env}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(env)
+        os.chdir(tmp)
+        try:
+            yield Path(tmp)
+        finally:
+            os.chdir(cwd)
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
+def _watchlist(size: int) -> List[Dict]:
+    return [{"symbol": f"SYM{i:04d}", "keywords": [f"SYM{i:04d}"]} for i in range(size)]
+
+
+def _previous_report(entries: List[Dict]) -> Dict:
+    day = date.today() - timedelta(days=7)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return {
+        "date": day.isoformat(),
+        "results": [
+            {"symbol": e["symbol"], "prediction": {"direction": "up", "confidence": {"value": 50, "label": "Medium"}}}
+            for e in entries
+        ],
+    }
+
+
+def run_size(size: int, stubs: Dict[str, StubServer], page_size: int = 5) -> Dict:
+    """Time gather, write and evaluate for a watchlist of ``size`` symbols."""
+    from evaluation.evaluator import Evaluator
+    from gather.pipeline import SymbolPipeline
+    from report_writer import ReportWriter
+    from run_model import RunModel
+
+    env = {
+        "NEWS_API_KEY": "stub",
+        "NEWS_API_URL": f"{stubs['news'].url}/v2/everything",
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_API_BASE": f"{stubs['openai'].url}/v1",
+        "STOCK_API_KEY": "stub",
+        "STOCK_API_URL": f"{stubs['stock'].url}/query",
+    }
+    before = {name: sum(s.calls.values()) for name, s in stubs.items()}
+    with _scratch(env) as tmp:
+        entries = _watchlist(size)
+        (tmp / "watchlist.json").write_text(json.dumps(entries))
+        Path("reports").mkdir()
+        previous = _previous_report(entries)
+        Path(f"reports/stock_report_{previous['date']}.json").write_text(json.dumps(previous))
+
+        pipeline = SymbolPipeline(entries)
+        fetch_latencies: List[float] = []
+        pipeline.fetcher.iter_articles = _timed_iter(pipeline.fetcher.iter_articles, fetch_latencies)
+        start = time.monotonic()
+        run = RunModel(
+            results=pipeline.run_many(entries, page_sizes={e["symbol"]: page_size for e in entries}),
+            stats=dict(pipeline.analyzer.stats),
+        )
+        gathered = time.monotonic()
+
+        ReportWriter(committer=NullCommitter()).write_run(run, commit=False)
+        written = time.monotonic()
+
+        evaluator = Evaluator(committer=NullCommitter())
+        series_latencies: List[float] = []
+        evaluator._fetch_series = _timed(evaluator._fetch_series, series_latencies)
+        evaluator.evaluate([e["symbol"] for e in entries], commit=False)
+        done = time.monotonic()
+
+    calls = {name: sum(s.calls.values()) - before[name] for name, s in stubs.items()}
+    total = done - start
+    return {
+        "symbols": size,
+        "seconds": {"gather": gathered - start, "write": written - gathered, "evaluate": done - written, "total": total},
+        "symbols_per_second": size / total if total else 0.0,
+        "fetch_latency": _summary(fetch_latencies),
+        "series_latency": _summary(series_latencies),
+        "calls_per_symbol": {name: n / size for name, n in calls.items()},
+        "sentiment": run.stats,
+    }
+
+
+def _summary(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def format_row(row: Dict) -> str:
+    fetch, series = row["fetch_latency"], row["series_latency"]
+    calls = ", ".join(f"{k} {v:.2f}" for k, v in row["calls_per_symbol"].items())
+    return (
+        f"{row['symbols']:>5} symbols  {row['symbols_per_second']:8.1f} sym/s  "
+        f"fetch p50/p95/p99 {fetch['p50'] * 1000:.0f}/{fetch['p95'] * 1000:.0f}/{fetch['p99'] * 1000:.0f} ms  "
+        f"series p50/p95/p99 {series['p50'] * 1000:.0f}/{series['p95'] * 1000:.0f}/{series['p99'] * 1000:.0f} ms  "
+        f"calls/symbol: {calls}"
+    )
+
+
+def main(argv: List[str] | None = None) -> List[Dict]:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="10,50,200", help="comma-separated watchlist sizes")
+    ap.add_argument("--page-size", type=int, default=5)
+    ap.add_argument("--latency-ms", type=float, default=50.0)
+    ap.add_argument("--jitter-ms", type=float, default=25.0)
+    ap.add_argument("--distribution", default="lognormal", choices=["fixed", "uniform", "exponential", "lognormal"])
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--throttle-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--json", dest="json_out", help="also write results to this file")
+    args = ap.parse_args(argv)
+
+    def config() -> StubConfig:
+        return StubConfig(args.latency_ms, args.jitter_ms, args.distribution,
+                          args.error_rate, args.throttle_rate, args.seed)
+
+    stubs = {"news": NewsApiStub(config()), "openai": OpenAIStub(config()), "stock": AlphaVantageStub(config())}
+    for stub in stubs.values():
+        stub.start()
+    try:
+        rows = []
+        for size in (int(s) for s in args.sizes.split(",") if s):
+            row = run_size(size, stubs, args.page_size)
+            print(format_row(row))
+            rows.append(row)
+    finally:
+        for stub in stubs.values():
+            stub.stop()
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(rows, indent=2))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
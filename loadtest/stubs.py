@@ -0,0 +1,205 @@
+"""Local stand-ins for the NewsAPI, OpenAI and Alpha Vantage endpoints."""
+import abc
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+WORDS = ["surges", "slumps", "beats estimates", "misses forecasts", "announces buyback",
+         "faces probe", "launches product", "cuts guidance", "rallies", "holds steady"]
+
+
+@dataclass
+class StubConfig:
+    """Latency, error and throttling behaviour of a stub endpoint.
+
+    ``distribution`` is one of ``fixed``, ``uniform`` (``latency_ms`` ± ``jitter_ms``),
+    ``exponential`` (mean ``latency_ms``) or ``lognormal`` (median ``latency_ms``,
+    ``jitter_ms`` as the spread in milliseconds).
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    distribution: str = "fixed"
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    seed: int | None = None
+    rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed)
+
+    def sample_latency(self) -> float:
+        """Return one latency draw in seconds."""
+        base = self.latency_ms
+        if self.distribution == "uniform":
+            ms = self.rng.uniform(base - self.jitter_ms, base + self.jitter_ms)
+        elif self.distribution == "exponential":
+            ms = self.rng.expovariate(1 / base) if base else 0.0
+        elif self.distribution == "lognormal":
+            sigma = self.jitter_ms / base if base else 0.0
+            ms = base * self.rng.lognormvariate(0, sigma) if base else 0.0
+        else:
+            ms = base
+        return max(ms, 0.0) / 1000
+
+
+class StubServer(abc.ABC):
+    """Threaded HTTP stub running in the background; records calls per endpoint."""
+
+    name = "stub"
+
+    def __init__(self, config: StubConfig | None = None) -> None:
+        self.config = config or StubConfig()
+        self.calls: Counter = Counter()
+        self.service_times: List[float] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                stub._handle(self)
+
+            def do_POST(self) -> None:
+                stub._handle(self)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        start = time.monotonic()
+        parsed = urlparse(handler.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        body = b""
+        if handler.command == "POST":
+            body = handler.rfile.read(int(handler.headers.get("Content-Length", 0)))
+        with self._lock:
+            roll = self.config.rng.random()
+            delay = self.config.sample_latency()
+        time.sleep(delay)
+
+        if roll < self.config.throttle_rate:
+            outcome = "throttled"
+            status, payload = self.throttled()
+        elif roll < self.config.throttle_rate + self.config.error_rate:
+            outcome = "error"
+            status, payload = 500, {"error": "injected failure"}
+        else:
+            outcome = "ok"
+            status, payload = self.respond(parsed.path, params, body)
+
+        data = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+        with self._lock:
+            self.calls[outcome] += 1
+            self.service_times.append(time.monotonic() - start)
+
+    def throttled(self) -> Tuple[int, Dict]:
+        return 429, {"error": "rate limited"}
+
+    @abc.abstractmethod
+    def respond(self, path: str, params: Dict[str, str], body: bytes) -> Tuple[int, Dict]:
+        """Return the status and JSON payload of a successful call."""
+
+
+class NewsApiStub(StubServer):
+    """Mimics ``GET /v2/everything``; headlines mention the first word of the query."""
+
+    name = "newsapi"
+
+    def throttled(self) -> Tuple[int, Dict]:
+        return 429, {"status": "error", "code": "rateLimited", "message": "Too many requests"}
+
+    def respond(self, path: str, params: Dict[str, str], body: bytes) -> Tuple[int, Dict]:
+        subject = (params.get("q") or "market").split()[0]
+        size = int(params.get("pageSize", 20))
+        today = date.today().isoformat()
+        with self._lock:
+            picks = [self.config.rng.choice(WORDS) for _ in range(size)]
+        articles = [
+            {
+                "title": f"{subject} {word} in story {i}",
+                "description": f"{subject} coverage",
+                "url": f"https://news.example/{subject}/{i}",
+                "publishedAt": f"{today}T{i % 24:02d}:00:00Z",
+            }
+            for i, word in enumerate(picks)
+        ]
+        return 200, {"status": "ok", "totalResults": size, "articles": articles}
+
+
+class OpenAIStub(StubServer):
+    """Mimics ``POST /v1/chat/completions`` returning a polarity score."""
+
+    name = "openai"
+
+    def throttled(self) -> Tuple[int, Dict]:
+        return 429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+
+    def respond(self, path: str, params: Dict[str, str], body: bytes) -> Tuple[int, Dict]:
+        with self._lock:
+            polarity = round(self.config.rng.uniform(-1, 1), 2)
+        return 200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-3.5-turbo",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": str(polarity)}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+
+class AlphaVantageStub(StubServer):
+    """Mimics ``TIME_SERIES_DAILY_ADJUSTED`` with a random walk over recent weekdays."""
+
+    name = "alphavantage"
+
+    def throttled(self) -> Tuple[int, Dict]:
+        # Alpha Vantage signals throttling with a 200 and a "Note" instead of a series.
+        return 200, {"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute."}
+
+    def respond(self, path: str, params: Dict[str, str], body: bytes) -> Tuple[int, Dict]:
+        series = {}
+        close = 100.0
+        day = date.today() - timedelta(days=45)
+        with self._lock:
+            steps = [self.config.rng.gauss(0, 1.5) for _ in range(46)]
+        for step in steps:
+            if day.weekday() < 5:
+                close = max(close + step, 1.0)
+                series[day.isoformat()] = {"4. close": f"{close:.2f}"}
+            day += timedelta(days=1)
+        return 200, {"Meta Data": {"2. Symbol": params.get("symbol", "")}, "Time Series (Daily)": series}
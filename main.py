@@ -1,151 +1,126 @@
 import sys
 import logging
 from pathlib import Path
-from typing import List, Dict
 from datetime import datetime
 
 from git import Repo
 
-from gather.news_fetcher import NewsFetcher
-from gather.sentiment_analyzer import SentimentAnalyzer
+from gather.pipeline import SymbolPipeline
+from budget import BudgetPlanner
+from calibration import update_calibration
+from deadline import Deadline, parse_deadline
 from evaluation.evaluator import Evaluator
-from relevance_matcher import RelevanceMatcher
 from report_writer import ReportWriter
+from run_model import RunModel
+from streaming import StreamRunner
+from sharding import SHARD_DIR, merge_shards, run_shard, run_sharded
 from learn_new_stocks import learn_new_stocks
-from watchlist import WatchlistManager
+from rescore import rescore
+from watchlist import WatchlistStore
 
 
-def apply_metrics_to_summary(summary_path: Path, metrics: Dict[str, Dict]):
-    """Insert accuracy and calibration info into the summary file."""
-    if not summary_path.exists():
-        return
-    lines = summary_path.read_text().splitlines()
-    new_lines: List[str] = []
-    current_symbol: str | None = None
-    for line in lines:
-        new_lines.append(line)
-        if line.startswith("Symbol:"):
-            parts = line.split()
-            current_symbol = parts[1] if len(parts) > 1 else None
-        if line.startswith("Insight:"):
-            metric = metrics.get(current_symbol or "")
-            new_lines.append("")
-            if metric and metric.get("accuracy_rate") is not None:
-                acc_pct = metric["accuracy_rate"] * 100
-                new_lines.append(f"Accuracy trend (last 7 days): {acc_pct:.0f}% accurate")
-                avg_conf = metric.get("avg_confidence", 0)
-                calib = metric.get("calibration", "")
-                new_lines.append(
-                    f"Confidence calibration: Avg {avg_conf:.0f}% confidence → {acc_pct:.0f}% accuracy → {calib}"
-                )
-            else:
-                new_lines.append("Accuracy trend (last 7 days): no data")
-                new_lines.append("Confidence calibration: no data")
-            new_lines.append("")
-    summary_path.write_text("\n".join(new_lines))
-
-
-
-
-def gather_flow(query: str = "stock market", commit: bool = True):
-    """Generate prediction reports for all symbols in the watchlist."""
+def build_run(query: str = "stock market", news_budget: int | None = None,
+              llm_budget: int | None = None, deadline: float | None = None) -> RunModel | None:
+    """Score every watchlist symbol into an in-memory run model.
+
+    With a news or LLM budget, a BudgetPlanner decides fetch depth and LLM
+    calls per symbol. Symbols it skips keep their last prediction, marked stale.
+    With a ``deadline`` (Unix timestamp), symbols that would finish late are
+    scored at reduced fidelity instead.
+    """
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
-    manager = WatchlistManager()
-    entries = manager.load()
+    entries = [e for e in WatchlistStore().load() if e.get("symbol")]
     if not entries:
         print("Watchlist is empty")
-        return
-
-    symbol_keywords = {e.get("symbol"): e.get("keywords", []) for e in entries if e.get("symbol")}
-    symbol_company = {e.get("symbol"): (e.get("keywords") or [""])[0] for e in entries if e.get("symbol")}
-
-    fetcher = NewsFetcher()
-    matcher = RelevanceMatcher(keyword_map=symbol_keywords)
-    analyzer = SentimentAnalyzer()
-    writer = ReportWriter()
-
+        return None
+
+    pacing = Deadline(deadline) if deadline is not None else None
+    pipeline = SymbolPipeline(entries, query)
+    if news_budget is None and llm_budget is None:
+        return RunModel(results=pipeline.run_many(entries, deadline=pacing), stats=dict(pipeline.analyzer.stats))
+
+    planner = BudgetPlanner()
+    symbols = [e["symbol"] for e in entries]
+    plan = planner.plan(
+        symbols,
+        news_quota=news_budget if news_budget is not None else len(symbols),
+        llm_quota=llm_budget if llm_budget is not None else len(symbols) * 5,
+    )
+    active = [e for e in entries if not plan[e["symbol"]].skipped]
+    fresh = pipeline.run_many(
+        active,
+        page_sizes={s: a.page_size for s, a in plan.items()},
+        llm_limits={s: a.llm_calls for s, a in plan.items()},
+        deadline=pacing,
+    )
+    by_symbol = {r.symbol: r for r in fresh}
     results = []
-    for entry in entries:
-        symbol = entry.get("symbol")
-        if not symbol:
-            continue
-        logging.info("Processing %s", symbol)
-        try:
-            news = fetcher.fetch(f"{symbol} {query}")
-        except Exception as e:
-            logging.exception("Failed to fetch news for %s: %s", symbol, e)
-            news = []
-
-        matched = matcher.match_headlines(news, symbol)
-        try:
-            analyzed = analyzer.analyze(matched)
-        except Exception as e:
-            logging.exception("Sentiment analysis failed for %s: %s", symbol, e)
-            analyzed = []
-
-        weighted = analyzer.weighted_score(analyzed)
-        confidence = analyzer.confidence(analyzed)
-        direction = "up" if weighted > 0 else "down" if weighted < 0 else "neutral"
-
-        results.append({
-            "symbol": symbol,
-            "company": symbol_company.get(symbol, ""),
-            "headlines": [m.get("title", "") for m in matched],
-            "prediction": {
-                "score": weighted,
-                "direction": direction,
-                "confidence": {
-                    "label": confidence[1],
-                    "value": confidence[0],
-                },
-            },
-        })
-
-    report_path = writer.write(results, commit=commit)
-    summary_path = writer.write_summary(results, commit=commit)
-    print(f"Report generated at {report_path}")
-    print(f"Summary generated at {summary_path}")
-    return report_path, summary_path
+    for symbol in symbols:
+        result = by_symbol.get(symbol) or planner.carry_forward(symbol)
+        if result:
+            results.append(result)
+    planner.save()
+    logging.info("Budget: polled %d of %d symbols", len(active), len(symbols))
+    return RunModel(results=results, stats=dict(pipeline.analyzer.stats))
+
+
+def gather_flow(query: str = "stock market", commit: bool = True,
+                news_budget: int | None = None, llm_budget: int | None = None,
+                deadline: float | None = None):
+    """Generate prediction reports for all symbols in the watchlist."""
+    run = build_run(query, news_budget, llm_budget, deadline)
+    if run is None:
+        return
+    paths = ReportWriter().write_run(run, commit=commit)
+    print(f"Report generated at {paths['json']}")
+    print(f"Summary generated at {paths['summary']}")
+    return paths["json"], paths["summary"]
 
 
 def evaluate_flow(symbol: str | None = None, commit: bool = True):
-    manager = WatchlistManager()
-    entries = manager.load()
-    symbols = [e.get("symbol") for e in entries if e.get("symbol")]
+    symbols = [e["symbol"] for e in WatchlistStore().load()]
     if symbol:
         symbols = [symbol]
     evaluator = Evaluator()
     eval_path = evaluator.evaluate(symbols, commit=commit)
     print(f"Evaluation report generated at {eval_path}")
+    try:
+        model_path = update_calibration()
+        if commit:
+            evaluator.committer.add_and_commit(model_path, "Update confidence calibration")
+    except Exception as e:
+        logging.exception("Calibration refit failed: %s", e)
     return eval_path
 
 
 def stock_forecast_flow() -> None:
     """Run gather and then evaluate previous predictions, committing results at the end."""
-    report_path, summary_path = gather_flow(commit=False)
+    run = build_run()
+    if run is None:
+        return
+    writer = ReportWriter()
+    # The evaluator locates the previous report relative to today's, so the
+    # JSON report is written before evaluation and the rest once metrics exist.
+    report_path = writer.write_run(run, ("json",), commit=False)["json"]
     eval_path = None
     try:
         eval_path = evaluate_flow(commit=False)
     except Exception as e:
         logging.exception("Forecast evaluation failed: %s", e)
 
-    metrics = {}
     suggestions_path = None
     try:
         from prediction_adjuster import generate_adjustment_file
-        metrics, suggestions_path = generate_adjustment_file()
+        run.metrics, suggestions_path = generate_adjustment_file()
     except Exception as e:
         logging.exception("Adjustment generation failed: %s", e)
 
-    try:
-        if metrics:
-            apply_metrics_to_summary(summary_path, metrics)
-    except Exception as e:
-        logging.exception("Failed to update summary with metrics: %s", e)
+    paths = writer.write_run(run, ("summary", "markdown"), commit=False)
 
     repo = Repo(Path(__file__).resolve().parent)
     repo.git.add(str(report_path))
-    repo.git.add(str(summary_path))
+    repo.git.add(str(paths["summary"]))
+    repo.git.add(str(paths["markdown"]))
     date_str = datetime.utcnow().strftime("%Y-%m-%d")
     eval_json = Path(f"evaluations/evaluation_{date_str}.json")
     eval_summary = Path(f"evaluations/evaluation_summary_{date_str}.txt")
@@ -160,22 +135,67 @@ def stock_forecast_flow() -> None:
         repo.git.add(str(log_file))
     if suggestions_path and Path(suggestions_path).exists():
         repo.git.add(str(suggestions_path))
+    model_path = Path('history/calibration_model.json')
+    if model_path.exists():
+        repo.git.add(str(model_path))
     repo.index.commit(f"Add forecast results for {date_str}")
 
 
+def _option(args: list[str], name: str, default: str | None = None) -> str | None:
+    """Return the value following ``name`` in ``args``."""
+    if name in args:
+        idx = args.index(name)
+        if idx + 1 < len(args):
+            return args[idx + 1]
+    return default
+
+
 def main():
     if len(sys.argv) < 2:
-        print('Usage: python main.py [gather|evaluate|stock_forecast|learn_new_stocks]')
+        print('Usage: python main.py [gather|evaluate|stock_forecast|learn_new_stocks|gather_shard|merge_shards|rescore|stream|calibrate]')
         return
     command = sys.argv[1]
+    args = sys.argv[2:]
+    shard_dir = Path(_option(args, '--shard-dir', str(SHARD_DIR)))
+    deadline = _option(args, '--deadline')
+    deadline = parse_deadline(deadline) if deadline else None
     if command == 'gather':
-        gather_flow()
+        shards = _option(args, '--shards')
+        if shards:
+            paths = run_sharded(int(shards), shard_dir, deadline=deadline, resume='--resume' in args)
+            print(f"Report generated at {paths['json']}")
+        else:
+            news_budget = _option(args, '--news-budget')
+            llm_budget = _option(args, '--llm-budget')
+            gather_flow(
+                news_budget=int(news_budget) if news_budget else None,
+                llm_budget=int(llm_budget) if llm_budget else None,
+                deadline=deadline,
+            )
     elif command == 'evaluate':
         evaluate_flow()
     elif command == 'stock_forecast':
         stock_forecast_flow()
     elif command == 'learn_new_stocks':
         learn_new_stocks()
+    elif command == 'gather_shard':
+        print(f"Shard written to {run_shard(int(args[0]), int(args[1]), shard_dir, deadline=deadline)}")
+    elif command == 'merge_shards':
+        date = _option(args, '--date', datetime.utcnow().strftime("%Y-%m-%d"))
+        run = merge_shards(int(args[0]), date, shard_dir)
+        paths = ReportWriter().write_run(run)
+        print(f"Report generated at {paths['json']}")
+    elif command == 'rescore':
+        tag = _option(args, '--tag', f"rescore-{datetime.utcnow().strftime('%Y-%m-%d')}")
+        workers = _option(args, '--workers')
+        out_dir = rescore(tag, workers=int(workers) if workers else None)
+        print(f"Re-scored reports written to {out_dir}")
+    elif command == 'calibrate':
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+        print(f"Calibration model written to {update_calibration(rebuild='--rebuild' in args)}")
+    elif command == 'stream':
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+        StreamRunner(WatchlistStore().load()).run(float(_option(args, '--interval', '300')))
     else:
         print(f'Unknown command: {command}')
 
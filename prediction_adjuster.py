@@ -1,20 +1,37 @@
 import json
+import math
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any
 
+from evaluation.evaluator import HORIZONS
+
 LOG_PATH = Path('history/prediction_accuracy_log.jsonl')
 
 
+def horizon_lag(horizon: int) -> int:
+    """Return the calendar days an ``horizon``-trading-day outcome needs to mature."""
+    return math.ceil(horizon * 7 / 5)
+
+
 def analyze(log_path: Path = LOG_PATH, days: int = 7) -> Dict[str, Dict[str, Any]]:
-    """Return metrics per symbol for the last `days` days."""
+    """Return metrics per symbol for the last `days` days.
+
+    Horizon accuracy looks back further for longer horizons: an h-day outcome
+    counts when its report falls within ``days + horizon_lag(h)`` days, so 5-
+    and 10-day outcomes have had time to mature.
+    """
     metrics: Dict[str, Dict[str, Any]] = {}
     if not log_path.exists():
         return metrics
 
-    cutoff = datetime.utcnow().date() - timedelta(days=days - 1)
-    entries_by_symbol: defaultdict[str, list[dict]] = defaultdict(list)
+    today = datetime.utcnow().date()
+    cutoff = today - timedelta(days=days - 1)
+    oldest = cutoff - timedelta(days=horizon_lag(max(HORIZONS)))
+    # The evaluator re-appends a record when longer horizons mature, so the
+    # latest record per date and symbol wins.
+    entries_by_symbol: defaultdict[str, dict[str, dict]] = defaultdict(dict)
 
     for line in log_path.read_text().splitlines():
         if not line.strip():
@@ -30,13 +47,21 @@ def analyze(log_path: Path = LOG_PATH, days: int = 7) -> Dict[str, Dict[str, Any
             d = datetime.strptime(date_str, "%Y-%m-%d").date()
         except ValueError:
             continue
-        if d < cutoff:
+        if d < oldest:
             continue
         symbol = record.get("symbol")
         if symbol:
-            entries_by_symbol[symbol].append(record)
+            entries_by_symbol[symbol][date_str] = record
+
+    for symbol, by_date in entries_by_symbol.items():
+        items = [r for date_str, r in by_date.items() if date_str >= cutoff.isoformat()]
+        horizon_hits: defaultdict[str, list[bool]] = defaultdict(list)
+        for date_str, i in by_date.items():
+            for h, outcome in (i.get("horizons") or {}).items():
+                window = cutoff - timedelta(days=horizon_lag(int(h)))
+                if outcome and outcome.get("accuracy") is not None and date_str >= window.isoformat():
+                    horizon_hits[h].append(bool(outcome["accuracy"]))
 
-    for symbol, items in entries_by_symbol.items():
         n = len(items)
         if n == 0:
             continue
@@ -66,8 +91,13 @@ def analyze(log_path: Path = LOG_PATH, days: int = 7) -> Dict[str, Dict[str, Any
             elif high_acc > 0.75:
                 suggestion = f"{symbol} has {high_acc*100:.0f}% accuracy for high-confidence BUY calls — suggest decreasing BUY threshold"
 
+        horizon_accuracy = {
+            h: sum(hits) / len(hits) for h, hits in sorted(horizon_hits.items(), key=lambda kv: int(kv[0]))
+        }
+
         metrics[symbol] = {
             "accuracy_rate": acc_rate,
+            "horizon_accuracy": horizon_accuracy,
             "avg_confidence": avg_conf,
             "calibration": calibration,
             "suggestion": suggestion,
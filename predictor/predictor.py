@@ -1,32 +1,39 @@
-from typing import List, Dict
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+
+def build_entity_index(insights: List[Dict]) -> Dict[str, List[Dict]]:
+    """Map each upper-cased affected entity to the insights that reference it."""
+    index: Dict[str, List[Dict]] = defaultdict(list)
+    for item in insights:
+        entities = item.get('affected_entities', []) or []
+        for entity in {str(e).upper() for e in entities}:
+            index[entity].append(item)
+    return index
+
 
 class StockPredictor:
     def predict(self, insights: List[Dict], symbol: str) -> float:
         """Return confidence-weighted sentiment for the specified symbol."""
         if not insights:
             return 0.0
+        return self.predict_batch(insights, [symbol])[symbol]
 
-        # filter insights referencing the target symbol
-        symbol_upper = symbol.upper()
-        relevant = []
-        for item in insights:
-            entities = item.get('affected_entities', []) or []
-            entities_upper = [str(e).upper() for e in entities]
-            if symbol_upper in entities_upper:
-                relevant.append(item)
-
-        if not relevant:
-            return 0.0
-
-        numerator = 0.0
-        denominator = 0.0
-        for item in relevant:
-            sentiment = float(item.get('sentiment', 0.0))
-            confidence = float(item.get('confidence_score', 0.0))
-            numerator += sentiment * confidence
-            denominator += confidence
-
-        if denominator == 0:
-            return 0.0
+    def predict_batch(self, insights: List[Dict], symbols: Iterable[str],
+                      index: Dict[str, List[Dict]] | None = None) -> Dict[str, float]:
+        """Return confidence-weighted sentiment for every symbol.
 
-        return numerator / denominator
+        ``index`` is the entity index of ``insights``; it is built here when not
+        supplied, so each insight is only examined once either way.
+        """
+        if index is None:
+            index = build_entity_index(insights)
+        predictions: Dict[str, float] = {}
+        for symbol in symbols:
+            numerator = denominator = 0.0
+            for item in index.get(symbol.upper(), []):
+                confidence = float(item.get('confidence_score', 0.0))
+                numerator += float(item.get('sentiment', 0.0)) * confidence
+                denominator += confidence
+            predictions[symbol] = numerator / denominator if denominator else 0.0
+        return predictions
@@ -0,0 +1,58 @@
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict
+
+
+@dataclass(slots=True)
+class Headline:
+    """A news headline as it moves from matching through sentiment scoring."""
+
+    title: str
+    relevance_score: float = 0.0
+    keyword: str = ""
+    published_at: str | None = None
+    cluster_size: int = 1
+    sentiment: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Headline":
+        sentiment = data.get("sentiment")
+        return cls(
+            title=data.get("title", "") or "",
+            relevance_score=float(data.get("relevance_score", 0.0)),
+            keyword=data.get("keyword", "") or "",
+            published_at=data.get("publishedAt"),
+            cluster_size=int(data.get("cluster_size", 1)),
+            sentiment=float(sentiment) if sentiment is not None else None,
+        )
+
+    @classmethod
+    def coerce(cls, item: "Headline | Dict[str, Any]") -> "Headline":
+        """Return ``item`` as a record, converting the JSON dict shape if needed."""
+        return item if isinstance(item, cls) else cls.from_dict(item)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "sentiment": self.sentiment,
+            "relevance_score": self.relevance_score,
+            "keyword": self.keyword,
+            "publishedAt": self.published_at,
+            "cluster_size": self.cluster_size,
+        }
+
+
+@dataclass(slots=True)
+class EvaluationRecord:
+    """Outcome of one prediction, as appended to the accuracy history."""
+
+    date: str
+    symbol: str
+    predicted_direction: str | None
+    actual_direction: str = "unknown"
+    confidence: int = 0
+    accuracy: bool | None = None
+    horizons: Dict[str, Dict | None] = field(default_factory=dict)
+    raw_confidence: int | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
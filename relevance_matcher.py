@@ -1,5 +1,9 @@
 import difflib
-from typing import Dict, List, Tuple
+import heapq
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from records import Headline
 
 DEFAULT_KEYWORDS: Dict[str, List[str]] = {
     "AAPL": ["Apple", "iPhone", "iPad", "Mac", "MacBook", "AirPods"],
@@ -38,18 +42,32 @@ class RelevanceMatcher:
                 best_kw = kw
         return best_score, best_kw
 
-    def match_headlines(self, news_items: List[dict], symbol: str, threshold: float = 0.3) -> List[dict]:
-        """Return news items with relevance >= threshold."""
-        matches: List[dict] = []
+    def fill_relevance(self, items: Iterable[Headline], symbol: str) -> List[Headline]:
+        """Return ``items`` with missing relevance scores recomputed for ``symbol``.
+
+        Reports written before headline details were archived only keep titles.
+        """
+        return [
+            item if item.relevance_score else replace(item, relevance_score=self.score(item.title, symbol)[0])
+            for item in items
+        ]
+
+    def iter_matches(self, news_items: Iterable[dict], symbol: str, threshold: float = 0.3) -> Iterator[Headline]:
+        """Lazily yield news items with relevance >= threshold, in input order."""
         for item in news_items:
-            title = item.get("title", "")
+            title = item.get("title", "") or ""
             score, kw = self.score(title, symbol)
             if score >= threshold:
-                matches.append({
-                    "title": title,
-                    "relevance_score": score,
-                    "keyword": kw,
-                    "publishedAt": item.get("publishedAt"),
-                })
-        matches.sort(key=lambda x: x["relevance_score"], reverse=True)
-        return matches
+                yield Headline(title, score, kw, item.get("publishedAt"))
+
+    def match_headlines(self, news_items: Iterable[dict], symbol: str, threshold: float = 0.3,
+                        limit: int | None = None) -> List[Headline]:
+        """Return news items with relevance >= threshold, most relevant first.
+
+        With ``limit``, only the top ``limit`` matches are kept in a heap while
+        ``news_items`` is consumed. Ties keep their input order either way.
+        """
+        matches = self.iter_matches(news_items, symbol, threshold)
+        if limit is not None:
+            return heapq.nlargest(limit, matches, key=lambda x: x.relevance_score)
+        return sorted(matches, key=lambda x: x.relevance_score, reverse=True)
@@ -1,17 +1,26 @@
 import json
-from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
 
 from textblob import TextBlob
 
 from repo_utils import Committer, GitCommitter
+from records import Headline
+from reporting.mermaid_utils import flowchart
+from run_model import RunModel, recommend
 
 REPORT_DIR = Path("reports")
+FORMATS = ("json", "summary", "markdown")
+
+INSIGHTS = {
+    "BUY": "Positive news flow may drive short-term gains.",
+    "AVOID": "Negative signals suggest caution in the short term.",
+    "HOLD": "Mixed outlook indicates waiting for clarity.",
+}
 
 
 class ReportWriter:
-    """Generate aggregated JSON prediction reports."""
+    """Render a run into JSON, text summary and Markdown reports."""
 
     def __init__(self, committer: Committer | None = None):
         REPORT_DIR.mkdir(exist_ok=True)
@@ -20,115 +29,134 @@ class ReportWriter:
 
     def recommendation_and_turnover(self, sent: float, conf_val: float, conf_label: str) -> tuple[str, str]:
         """Return recommendation and expected turnover period."""
-        if sent <= -0.2 or conf_val < 30:
-            rec = "AVOID"
-        elif sent >= 0.2 and conf_val >= 60:
-            rec = "BUY"
-        else:
-            rec = "HOLD"
-
-        turnover = "Indeterminate"
-        label = conf_label.lower()
-        if label == "high":
-            turnover = "2-3 days"
-        elif label == "medium":
-            turnover = "4-7 days"
-        elif label == "low":
-            turnover = "7-10 days"
-        return rec, turnover
+        return recommend(sent, conf_val, conf_label)
 
-    def write(self, results: List[Dict], commit: bool = True) -> Path:
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
-        filename = REPORT_DIR / f"stock_report_{date_str}.json"
-        payload = {
-            "date": date_str,
-            "results": results,
-        }
-        filename.write_text(json.dumps(payload, indent=2))
-        if commit:
-            self.committer.add_and_commit(filename, f"Add stock report for {date_str}")
-        return filename
-
-    def write_summary(self, results: List[Dict], commit: bool = True) -> Path:
-        """Generate a human readable text summary for all stocks."""
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
-        filename = REPORT_DIR / f"stock_summary_{date_str}.txt"
-
-        def rec_and_turnover(sent: float, conf_val: float, conf_label: str) -> tuple[str, str]:
-            return self.recommendation_and_turnover(sent, conf_val, conf_label)
-
-        order = {"BUY": 0, "HOLD": 1, "AVOID": 2}
-
-        summary_data = []
-        for item in results:
-            pred = item.get("prediction", {})
-            sentiment = float(pred.get("score", 0.0))
-            conf = pred.get("confidence", {})
-            conf_val = float(conf.get("value", 0.0))
-            conf_label = str(conf.get("label", ""))
-            rec, turnover = rec_and_turnover(sentiment, conf_val, conf_label)
-            company = item.get("company", "")
-            headlines = item.get("headlines", [])[:2]
-            summary_data.append(
-                {
-                    "symbol": item.get("symbol", ""),
-                    "company": company,
-                    "sentiment": sentiment,
-                    "confidence_value": conf_val,
-                    "confidence_label": conf_label,
-                    "headlines": headlines,
-                    "rec": rec,
-                    "turnover": turnover,
-                }
-            )
-
-        summary_data.sort(key=lambda x: order.get(x["rec"], 3))
+    def render_json(self, run: RunModel) -> str:
+        return json.dumps(run.to_payload(), indent=2)
 
+    def render_summary(self, run: RunModel) -> str:
+        """Render a human readable text summary for all stocks."""
         lines: List[str] = []
-        for entry in summary_data:
-            sym_line = f"Symbol: {entry['symbol']}"
-            if entry["company"]:
-                sym_line += f" ({entry['company']})"
+        for entry in run.ranked():
+            sym_line = f"Symbol: {entry.symbol}"
+            if entry.company:
+                sym_line += f" ({entry.company})"
             lines.append("-" * 40)
             lines.append(sym_line)
             lines.append("")
-            if entry["headlines"]:
+            top = entry.items[:2]
+            if top:
                 lines.append("Top Headline:")
-                for h in entry["headlines"]:
-                    pol = TextBlob(h).sentiment.polarity
-                    if pol > 0.05:
-                        rationale = "positive sentiment"
-                    elif pol < -0.05:
-                        rationale = "negative sentiment"
-                    else:
-                        rationale = "mixed sentiment"
-                    lines.append(f"- \"{h}\" → {rationale}")
+                for item in top:
+                    lines.append(f"- \"{item.title}\" → {_rationale(item)}")
                 lines.append("")
 
-            sent_score = f"{entry['sentiment']:+.2f}"
-            conf_str = f"{entry['confidence_value']:.0f}% ({entry['confidence_label']})"
+            sent_score = f"{entry.score:+.2f}"
+            conf_str = f"{entry.confidence_value:.0f}% ({entry.confidence_label})"
             lines.append(f"Sentiment Score: {sent_score}")
             lines.append(f"Confidence: {conf_str}")
+            if entry.stale:
+                lines.append(f"Stale: carried forward from {entry.as_of}")
+            if entry.degraded:
+                lines.append(f"Fidelity: {entry.fidelity} (deadline)")
             lines.append("")
 
-            emoji = "📈" if entry["rec"] == "BUY" else "🔻" if entry["rec"] == "AVOID" else "➖"
-            lines.append(f"{emoji} Recommendation: {entry['rec']}")
-            lines.append(f"💡 Estimated Turnover: {entry['turnover']}")
-
-            if entry["rec"] == "BUY":
-                insight = "Positive news flow may drive short-term gains."
-            elif entry["rec"] == "AVOID":
-                insight = "Negative signals suggest caution in the short term."
-            else:
-                insight = "Mixed outlook indicates waiting for clarity."
-
-            lines.append(f"Insight: {insight}")
+            emoji = "📈" if entry.recommendation == "BUY" else "🔻" if entry.recommendation == "AVOID" else "➖"
+            lines.append(f"{emoji} Recommendation: {entry.recommendation}")
+            lines.append(f"💡 Estimated Turnover: {entry.turnover}")
+            lines.append(f"Insight: {INSIGHTS.get(entry.recommendation, INSIGHTS['HOLD'])}")
             lines.append("")
 
+            if run.metrics:
+                lines.extend(_metric_lines(run.metrics.get(entry.symbol)))
+                lines.append("")
+
         if lines:
             lines.append("-" * 40)
+        return "\n".join(lines)
+
+    def render_markdown(self, run: RunModel) -> str:
+        """Render a multi-symbol Markdown report."""
+        nodes = {'A': 'Fetch News', 'B': 'Analyze Sentiment', 'C': 'Predict Stock'}
+        edges = [('A', 'B'), ('B', 'C')]
+        lines = [f"# Stock Prediction Report - {run.date}"]
+        for entry in run.ranked():
+            lines.append("")
+            lines.append(f"## {entry.symbol}" + (f" ({entry.company})" if entry.company else ""))
+            lines.append("")
+            lines.append("### News Headlines")
+            if not entry.items:
+                lines.append("No relevant headlines found.")
+            for item in entry.items:
+                lines.append(f"- {item.title}")
+            lines.append("")
+            lines.append("### Prediction")
+            lines.append(f"Predicted movement score: {entry.score:+.2f}")
+            lines.append(f"Final predicted direction: {entry.direction}")
+            lines.append(f"Confidence: {entry.confidence_value:.1f}% ({entry.confidence_label})")
+            lines.append(f"Recommendation: {entry.recommendation} (turnover {entry.turnover})")
+            if entry.stale:
+                lines.append(f"Stale: carried forward from {entry.as_of}")
+            if entry.degraded:
+                lines.append(f"Fidelity: {entry.fidelity} (deadline)")
+            if run.metrics:
+                lines.append("")
+                lines.extend(_metric_lines(run.metrics.get(entry.symbol)))
+        lines.append("")
+        lines.append("## Process Diagram")
+        lines.append(flowchart(nodes, edges))
+        return "\n".join(lines)
+
+    def write_run(self, run: RunModel, formats: tuple[str, ...] = FORMATS, commit: bool = True) -> Dict[str, Path]:
+        """Render ``run`` once into each requested format and write the files."""
+        renderers = {
+            "json": (f"stock_report_{run.date}.json", self.render_json, "report"),
+            "summary": (f"stock_summary_{run.date}.txt", self.render_summary, "summary"),
+            "markdown": (f"stock_report_{run.date}.md", self.render_markdown, "markdown report"),
+        }
+        paths: Dict[str, Path] = {}
+        for fmt in formats:
+            name, render, label = renderers[fmt]
+            filename = REPORT_DIR / name
+            filename.write_text(render(run))
+            if commit:
+                self.committer.add_and_commit(filename, f"Add stock {label} for {run.date}")
+            paths[fmt] = filename
+        return paths
 
-        filename.write_text("\n".join(lines))
-        if commit:
-            self.committer.add_and_commit(filename, f"Add stock summary for {date_str}")
-        return filename
+    def write(self, results: List[Dict], commit: bool = True) -> Path:
+        return self.write_run(RunModel.from_results(results), ("json",), commit)["json"]
+
+    def write_summary(self, results: List[Dict], commit: bool = True) -> Path:
+        """Generate a human readable text summary for all stocks."""
+        return self.write_run(RunModel.from_results(results), ("summary",), commit)["summary"]
+
+
+def _rationale(item: Headline) -> str:
+    pol = item.sentiment
+    if pol is None:
+        pol = TextBlob(item.title).sentiment.polarity
+    if pol > 0.05:
+        return "positive sentiment"
+    if pol < -0.05:
+        return "negative sentiment"
+    return "mixed sentiment"
+
+
+def _metric_lines(metric: Dict | None) -> List[str]:
+    if metric and metric.get("accuracy_rate") is not None:
+        acc_pct = metric["accuracy_rate"] * 100
+        avg_conf = metric.get("avg_confidence", 0)
+        calib = metric.get("calibration", "")
+        lines = [
+            f"Accuracy trend (last 7 days): {acc_pct:.0f}% accurate",
+            f"Confidence calibration: Avg {avg_conf:.0f}% confidence → {acc_pct:.0f}% accuracy → {calib}",
+        ]
+        horizons = metric.get("horizon_accuracy") or {}
+        if horizons:
+            lines.append("Accuracy by horizon: " + ", ".join(f"{h}d {rate * 100:.0f}%" for h, rate in horizons.items()))
+        return lines
+    return [
+        "Accuracy trend (last 7 days): no data",
+        "Confidence calibration: no data",
+    ]
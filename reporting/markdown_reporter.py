@@ -1,8 +1,9 @@
-import os
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List
 from git import Repo
 
+from predictor.predictor import StockPredictor, build_entity_index
 from .mermaid_utils import flowchart
 
 REPORT_DIR = Path('reports')
@@ -12,26 +13,20 @@ class MarkdownReporter:
         REPORT_DIR.mkdir(exist_ok=True)
         self.repo = Repo(Path(__file__).resolve().parents[1])
 
-    def generate_report(self, news_items, insights, prediction, symbol: str) -> Path:
-        date_str = datetime.utcnow().strftime('%Y-%m-%d')
-        filename = REPORT_DIR / f'prediction-{date_str}.md'
+    def _diagram(self) -> str:
         nodes = {'A': 'Fetch News', 'B': 'Analyze Sentiment', 'C': 'Predict Stock'}
         edges = [('A', 'B'), ('B', 'C')]
-        diagram = flowchart(nodes, edges)
-        lines = [f"# Stock Prediction Report - {date_str}", f"**Symbol:** {symbol}", '', '## News Headlines']
-        for item in news_items:
-            lines.append(f"- {item.get('title')}")
+        return flowchart(nodes, edges)
 
-        # Filter insights relevant to symbol
+    def _symbol_lines(self, news_items, relevant: List[Dict], prediction: float, symbol: str,
+                      heading: str = '##') -> List[str]:
         symbol_upper = symbol.upper()
-        relevant: list[dict] = []
-        for ins in insights:
-            entities = [str(e).upper() for e in ins.get('affected_entities', [])]
-            if symbol_upper in entities:
-                relevant.append(ins)
+        lines = [f'{heading} News Headlines']
+        for item in news_items:
+            lines.append(f"- {item.get('title')}")
 
         lines.append('')
-        lines.append(f'## Relevant Insights for {symbol_upper}')
+        lines.append(f'{heading} Relevant Insights for {symbol_upper}')
         if not relevant:
             lines.append('No direct references to this symbol found.')
         else:
@@ -56,14 +51,47 @@ class MarkdownReporter:
         direction_sign = '+' if prediction > 0.05 else '-' if prediction < -0.05 else '0'
 
         lines.append('')
-        lines.append('## Prediction')
+        lines.append(f'{heading} Prediction')
         lines.append(f"Predicted movement score: {prediction:+.2f}")
         lines.append(f"Final predicted direction: {direction_sign}")
         lines.append(f"Average confidence: {avg_conf:.1f}%")
-        lines.append('')
-        lines.append('## Process Diagram')
-        lines.append(diagram)
+        return lines
+
+    def _write(self, filename: Path, lines: List[str], date_str: str, commit: bool) -> Path:
         filename.write_text('\n'.join(lines))
-        self.repo.git.add(str(filename))
-        self.repo.index.commit(f"Add prediction report for {date_str}")
+        if commit:
+            self.repo.git.add(str(filename))
+            self.repo.index.commit(f"Add prediction report for {date_str}")
         return filename
+
+    def generate_report(self, news_items, insights, prediction, symbol: str, commit: bool = True) -> Path:
+        """Write the report for a single symbol; see ``generate_batch_report``."""
+        return self.generate_batch_report({symbol: news_items}, insights, {symbol: prediction}, commit)
+
+    def generate_batch_report(self, news_by_symbol: Dict[str, List[Dict]], insights: List[Dict],
+                              predictions: Dict[str, float] | None = None, commit: bool = True) -> Path:
+        """Write one report covering every symbol in ``news_by_symbol``.
+
+        The entity index is built once for all symbols; predictions are computed
+        in a single batch unless supplied by the caller.
+        """
+        date_str = datetime.utcnow().strftime('%Y-%m-%d')
+        filename = REPORT_DIR / f'prediction-{date_str}.md'
+        symbols = list(news_by_symbol)
+        index = build_entity_index(insights)
+        if predictions is None:
+            predictions = StockPredictor().predict_batch(insights, symbols, index)
+
+        lines = [f"# Stock Prediction Report - {date_str}", f"**Symbols:** {', '.join(symbols)}"]
+        for symbol in symbols:
+            lines.append('')
+            lines.append(f'## {symbol}')
+            lines.append('')
+            lines.extend(self._symbol_lines(
+                news_by_symbol[symbol], index.get(symbol.upper(), []),
+                predictions.get(symbol, 0.0), symbol, heading='###',
+            ))
+        lines.append('')
+        lines.append('## Process Diagram')
+        lines.append(self._diagram())
+        return self._write(filename, lines, date_str, commit)
@@ -0,0 +1,94 @@
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from calibration import CalibrationModel
+from gather.pipeline import build_result
+from gather.sentiment_analyzer import SentimentAnalyzer
+from relevance_matcher import RelevanceMatcher
+from run_model import RunModel
+from watchlist import WatchlistStore
+
+REPORT_DIR = Path("reports")
+RESCORE_DIR = Path("reports/rescored")
+
+
+def _rescore_chunk(paths: List[str], out_dir: str, keyword_map: Dict[str, List[str]]) -> List[Dict]:
+    """Re-score one chunk of archived reports; runs inside a worker process."""
+    analyzer = SentimentAnalyzer()
+    matcher = RelevanceMatcher(keyword_map=keyword_map or None)
+    calibration = CalibrationModel.load()
+    done = []
+    for path in map(Path, paths):
+        payload = json.loads(path.read_text())
+        run = RunModel.from_results(payload.get("results", []), date=payload.get("date"))
+        groups = [matcher.fill_relevance(r.items, r.symbol) for r in run.results]
+        before = dict(analyzer.stats)
+        analyzed = analyzer.analyze_many(groups)
+        # Measure recency from the end of the report's day, not from today.
+        as_of = datetime.strptime(run.date, "%Y-%m-%d") + timedelta(days=1)
+        run.results = [
+            build_result(analyzer, r.symbol, r.company, items, as_of) for r, items in zip(run.results, analyzed)
+        ]
+        calibration.apply(run.results)
+        run.stats = {k: v - before.get(k, 0) for k, v in analyzer.stats.items()}
+        target = Path(out_dir) / path.name
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(json.dumps(run.to_payload(), indent=2))
+        tmp.replace(target)
+        done.append({"report": path.name, "symbols": len(run.results)})
+    return done
+
+
+def _completed(progress: Path) -> set[str]:
+    if not progress.exists():
+        return set()
+    done = set()
+    for line in progress.read_text().splitlines():
+        try:
+            done.add(json.loads(line)["report"])
+        except (json.JSONDecodeError, KeyError):
+            continue
+    return done
+
+
+def rescore(tag: str, workers: int | None = None, chunk_size: int = 8,
+            report_dir: Path = REPORT_DIR, out_root: Path = RESCORE_DIR) -> Path:
+    """Re-score every archived report into ``out_root/<tag>`` using a process pool.
+
+    Originals are never modified. Finished reports are appended to
+    ``progress.jsonl`` in the output directory, so rerunning the same tag
+    resumes where an interrupted run stopped.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    out_dir = Path(out_root) / tag
+    out_dir.mkdir(parents=True, exist_ok=True)
+    progress = out_dir / "progress.jsonl"
+    done = _completed(progress)
+    pending = [str(p) for p in sorted(Path(report_dir).glob("stock_report_*.json")) if p.name not in done]
+    total = len(pending) + len(done)
+    if not pending:
+        logging.info("All %d reports already re-scored in %s", total, out_dir)
+        return out_dir
+
+    keyword_map = {e["symbol"]: e.get("keywords", []) for e in WatchlistStore().load() if e.get("symbol")}
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool, open(progress, "a") as log:
+        futures = [pool.submit(_rescore_chunk, chunk, str(out_dir), keyword_map) for chunk in chunks]
+        for fut in as_completed(futures):
+            try:
+                finished = fut.result()
+            except Exception as e:
+                logging.exception("Re-score chunk failed: %s", e)
+                continue
+            stamp = datetime.utcnow().isoformat(timespec="seconds")
+            for entry in finished:
+                log.write(json.dumps(dict(entry, at=stamp)) + "\n")
+            log.flush()
+            done.update(e["report"] for e in finished)
+            logging.info("Re-scored %d/%d reports", len(done), total)
+    return out_dir
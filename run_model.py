@@ -0,0 +1,159 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List
+
+from records import Headline
+
+REC_ORDER = {"BUY": 0, "HOLD": 1, "AVOID": 2}
+
+
+def recommend(sent: float, conf_val: float, conf_label: str) -> tuple[str, str]:
+    """Return recommendation and expected turnover period."""
+    if sent <= -0.2 or conf_val < 30:
+        rec = "AVOID"
+    elif sent >= 0.2 and conf_val >= 60:
+        rec = "BUY"
+    else:
+        rec = "HOLD"
+
+    turnover = "Indeterminate"
+    label = conf_label.lower()
+    if label == "high":
+        turnover = "2-3 days"
+    elif label == "medium":
+        turnover = "4-7 days"
+    elif label == "low":
+        turnover = "7-10 days"
+    return rec, turnover
+
+
+@dataclass(slots=True)
+class SymbolResult:
+    """Prediction and recommendation for one symbol in a run."""
+
+    symbol: str
+    company: str = ""
+    items: List[Headline] = field(default_factory=list)
+    score: float = 0.0
+    direction: str = "neutral"
+    confidence_value: float = 0.0
+    confidence_label: str = "Low"
+    as_of: str | None = None
+    fidelity: str = "full"
+    raw_confidence: float | None = None
+    raw_label: str | None = None
+    # Articles NewsAPI matched for the query, before any page size cap.
+    news_volume: int | None = None
+    recommendation: str = field(init=False, default="")
+    turnover: str = field(init=False, default="")
+
+    def __post_init__(self) -> None:
+        self.items = [Headline.coerce(i) for i in self.items]
+        self.refresh_recommendation()
+
+    def refresh_recommendation(self) -> None:
+        # ``recommend`` thresholds are tuned for the raw scale, not calibrated hit rates.
+        if self.raw_confidence is None:
+            value, label = self.confidence_value, self.confidence_label
+        else:
+            value, label = self.raw_confidence, self.raw_label or self.confidence_label
+        self.recommendation, self.turnover = recommend(self.score, value, label)
+
+    @property
+    def headlines(self) -> List[str]:
+        return [i.title for i in self.items]
+
+    @property
+    def stale(self) -> bool:
+        """True when the prediction was carried forward from an earlier run."""
+        return self.as_of is not None
+
+    @property
+    def degraded(self) -> bool:
+        """True when the run fell back to a cheaper path to meet its deadline."""
+        return self.fidelity != "full"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "symbol": self.symbol,
+            "company": self.company,
+            "headlines": self.headlines,
+            "items": [i.to_dict() for i in self.items],
+            "prediction": {
+                "score": self.score,
+                "direction": self.direction,
+                "confidence": {
+                    "label": self.confidence_label,
+                    "value": self.confidence_value,
+                },
+            },
+            "recommendation": {
+                "action": self.recommendation,
+                "turnover": self.turnover,
+            },
+        }
+        if self.raw_confidence is not None:
+            data["prediction"]["confidence"]["raw"] = self.raw_confidence
+        if self.raw_label is not None:
+            data["prediction"]["confidence"]["raw_label"] = self.raw_label
+        if self.news_volume is not None:
+            data["news_volume"] = self.news_volume
+        if self.stale:
+            data["stale"] = True
+            data["as_of"] = self.as_of
+        if self.degraded:
+            data["fidelity"] = self.fidelity
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SymbolResult":
+        """Build a result from the JSON report shape."""
+        pred = data.get("prediction", {})
+        conf = pred.get("confidence", {})
+        items = data.get("items")
+        if items is None:
+            items = [Headline(h) for h in data.get("headlines", [])]
+        return cls(
+            symbol=data.get("symbol", ""),
+            company=data.get("company", ""),
+            items=[Headline.coerce(i) for i in items],
+            score=float(pred.get("score", 0.0)),
+            direction=pred.get("direction", "neutral"),
+            confidence_value=float(conf.get("value", 0.0)),
+            confidence_label=str(conf.get("label", "")),
+            as_of=data.get("as_of"),
+            fidelity=data.get("fidelity", "full"),
+            raw_confidence=conf.get("raw"),
+            raw_label=conf.get("raw_label"),
+            news_volume=data.get("news_volume"),
+        )
+
+
+@dataclass(slots=True)
+class RunModel:
+    """All predictions, recommendations and metrics produced by one run."""
+
+    results: List[SymbolResult] = field(default_factory=list)
+    metrics: Dict[str, Dict] = field(default_factory=dict)
+    stats: Dict[str, int] = field(default_factory=dict)
+    date: str = field(default_factory=lambda: datetime.utcnow().strftime("%Y-%m-%d"))
+
+    def ranked(self) -> List[SymbolResult]:
+        """Return results ordered BUY, HOLD, AVOID."""
+        return sorted(self.results, key=lambda r: REC_ORDER.get(r.recommendation, 3))
+
+    def to_payload(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "date": self.date,
+            "results": [r.to_dict() for r in self.results],
+        }
+        if self.stats:
+            payload["stats"] = self.stats
+        return payload
+
+    @classmethod
+    def from_results(cls, results: List[Dict], date: str | None = None) -> "RunModel":
+        run = cls(results=[SymbolResult.from_dict(r) for r in results])
+        if date:
+            run.date = date
+        return run
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from deadline import Deadline
+from gather.pipeline import SymbolPipeline
+from report_writer import ReportWriter
+from run_model import RunModel, SymbolResult
+from watchlist import WatchlistStore
+
+SHARD_DIR = Path("shards")
+
+
+def shard_of(symbol: str, shards: int) -> int:
+    """Return the shard index for ``symbol``; stable across processes and machines."""
+    digest = hashlib.sha1(symbol.upper().encode()).hexdigest()
+    return int(digest[:8], 16) % shards
+
+
+def shard_path(index: int, shards: int, date: str, shard_dir: Path = SHARD_DIR) -> Path:
+    return Path(shard_dir) / date / f"shard-{index:03d}-of-{shards:03d}.json"
+
+
+def run_shard(index: int, shards: int, shard_dir: Path = SHARD_DIR,
+              query: str = "stock market", date: str | None = None,
+              deadline: float | None = None) -> Path:
+    """Score the symbols of one shard and write its partial result file.
+
+    With a ``deadline`` (Unix timestamp) the shard paces itself against it
+    like an unsharded run.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    date = date or datetime.utcnow().strftime("%Y-%m-%d")
+    entries = [
+        e for e in WatchlistStore().load()
+        if e.get("symbol") and shard_of(e["symbol"], shards) == index
+    ]
+    results: List[Dict] = []
+    stats: Dict[str, int] = {}
+    if entries:
+        pipeline = SymbolPipeline(entries, query)
+        pacing = Deadline(deadline) if deadline is not None else None
+        results = [r.to_dict() for r in pipeline.run_many(entries, deadline=pacing)]
+        stats = pipeline.analyzer.stats
+
+    path = shard_path(index, shards, date, shard_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"date": date, "shard": index, "shards": shards, "results": results, "stats": stats}
+    # Write then rename so a crashed worker never leaves a partial file that
+    # the merge step would mistake for a finished shard.
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, indent=2))
+    tmp.replace(path)
+    logging.info("Shard %d/%d wrote %d symbols to %s", index, shards, len(results), path)
+    return path
+
+
+def missing_shards(shards: int, date: str, shard_dir: Path = SHARD_DIR) -> List[int]:
+    return [i for i in range(shards) if not shard_path(i, shards, date, shard_dir).exists()]
+
+
+def merge_shards(shards: int, date: str, shard_dir: Path = SHARD_DIR) -> RunModel:
+    """Combine all partial results for ``date`` into one run in watchlist order."""
+    missing = missing_shards(shards, date, shard_dir)
+    if missing:
+        raise FileNotFoundError(f"Missing shards for {date}: {missing}")
+    by_symbol: Dict[str, SymbolResult] = {}
+    stats: Counter = Counter()
+    for i in range(shards):
+        payload = json.loads(shard_path(i, shards, date, shard_dir).read_text())
+        stats.update(payload.get("stats", {}))
+        for item in payload.get("results", []):
+            result = SymbolResult.from_dict(item)
+            by_symbol[result.symbol] = result
+    order = {e.get("symbol"): n for n, e in enumerate(WatchlistStore().load())}
+    results = sorted(by_symbol.values(), key=lambda r: order.get(r.symbol, len(order)))
+    return RunModel(results=results, stats=dict(stats), date=date)
+
+
+def run_sharded(shards: int, shard_dir: Path = SHARD_DIR, query: str = "stock market",
+                commit: bool = True, retries: int = 1, deadline: float | None = None,
+                resume: bool = False) -> Dict[str, Path]:
+    """Run every shard in a local process pool, then merge and write the reports.
+
+    A fresh run first clears today's shard files, so it always reflects the
+    current watchlist and news. With ``resume``, shards whose result file
+    already exists are kept and only the missing ones are run. Failed shards
+    are retried ``retries`` times either way.
+    """
+    date = datetime.utcnow().strftime("%Y-%m-%d")
+    if not resume:
+        for i in range(shards):
+            shard_path(i, shards, date, shard_dir).unlink(missing_ok=True)
+    for attempt in range(retries + 1):
+        pending = missing_shards(shards, date, shard_dir)
+        if not pending:
+            break
+        if attempt:
+            logging.warning("Retrying failed shards: %s", pending)
+        with ProcessPoolExecutor(max_workers=len(pending)) as pool:
+            futures = {i: pool.submit(run_shard, i, shards, shard_dir, query, date, deadline) for i in pending}
+            for i, fut in futures.items():
+                try:
+                    fut.result()
+                except Exception as e:
+                    logging.exception("Shard %d/%d failed: %s", i, shards, e)
+
+    run = merge_shards(shards, date, shard_dir)
+    return ReportWriter().write_run(run, commit=commit)
@@ -0,0 +1,213 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from dateutil import parser
+
+from gather.dedup import collapse_near_duplicates
+from gather.news_fetcher import NewsFetcher
+from gather.sentiment_analyzer import SentimentAnalyzer, confidence_from
+from records import Headline
+from relevance_matcher import RelevanceMatcher
+
+STREAM_EVENTS = Path("history/stream_events.jsonl")
+# Matches the batch recency weight, which halves after 3.5 days.
+HALF_LIFE_SECONDS = 3.5 * 86400
+
+
+@dataclass(slots=True)
+class DecayedScore:
+    """Running sentiment sums for one symbol with exponential recency decay.
+
+    All sums are scaled to the time of the newest article seen, so adding an
+    article or reading the score is O(1) regardless of how many came before.
+    """
+
+    half_life: float = HALF_LIFE_SECONDS
+    as_of: float | None = None
+    weighted: float = 0.0
+    weight: float = 0.0
+    count: float = 0.0
+    relevance: float = 0.0
+    abs_sentiment: float = 0.0
+    articles: float = 0.0
+
+    def _decay(self, seconds: float) -> float:
+        return 0.5 ** (seconds / self.half_life)
+
+    def advance(self, ts: float) -> None:
+        """Decay the sums forward to ``ts``."""
+        if self.as_of is None:
+            self.as_of = ts
+            return
+        if ts <= self.as_of:
+            return
+        factor = self._decay(ts - self.as_of)
+        self.weighted *= factor
+        self.weight *= factor
+        self.count *= factor
+        self.relevance *= factor
+        self.abs_sentiment *= factor
+        self.articles *= factor
+        self.as_of = ts
+
+    def add(self, item: Headline, ts: float) -> None:
+        self.advance(ts)
+        age = self._decay(self.as_of - ts)
+        sentiment = item.sentiment or 0.0
+        weight = item.relevance_score * item.cluster_size * age
+        self.weighted += sentiment * weight
+        self.weight += weight
+        self.count += age
+        self.relevance += item.relevance_score * age
+        self.abs_sentiment += abs(sentiment) * age
+        self.articles += item.cluster_size * age
+
+    def score(self) -> float:
+        return self.weighted / self.weight if self.weight else 0.0
+
+    def confidence(self) -> Tuple[float, str]:
+        if not self.count:
+            return 0.0, "Low"
+        return confidence_from(self.relevance / self.count, self.abs_sentiment / self.count, self.articles)
+
+
+class StreamPredictor:
+    """Maintain per-symbol predictions and report when one flips."""
+
+    def __init__(self, half_life: float = HALF_LIFE_SECONDS) -> None:
+        self.half_life = half_life
+        self.scores: Dict[str, DecayedScore] = {}
+        self.state: Dict[str, Tuple[str, str]] = {}
+
+    def ingest(self, symbol: str, items: List[Tuple[Headline, float]]) -> Dict | None:
+        """Fold scored ``(headline, timestamp)`` pairs into ``symbol``.
+
+        Returns an event if the symbol's direction or confidence label changed.
+        """
+        if not items:
+            return None
+        acc = self.scores.setdefault(symbol, DecayedScore(self.half_life))
+        for item, ts in items:
+            acc.add(item, ts)
+        return self._check(symbol, acc)
+
+    def refresh(self, now: float) -> List[Dict]:
+        """Decay every symbol to ``now`` and return events for labels that lapsed as news aged."""
+        events = []
+        for symbol, acc in self.scores.items():
+            acc.advance(now)
+            event = self._check(symbol, acc)
+            if event:
+                events.append(event)
+        return events
+
+    def _check(self, symbol: str, acc: DecayedScore) -> Dict | None:
+        score = acc.score()
+        direction = "up" if score > 0 else "down" if score < 0 else "neutral"
+        value, label = acc.confidence()
+        previous = self.state.get(symbol, ("neutral", "Low"))
+        if (direction, label) == previous:
+            return None
+        self.state[symbol] = (direction, label)
+        return {
+            "symbol": symbol,
+            "at": datetime.fromtimestamp(acc.as_of, timezone.utc).isoformat(timespec="seconds"),
+            "direction": direction,
+            "previous_direction": previous[0],
+            "confidence": {"label": label, "value": value},
+            "previous_label": previous[1],
+            "score": score,
+        }
+
+
+def _timestamp(published: str | None, default: float) -> float:
+    if not published:
+        return default
+    try:
+        dt = parser.parse(published)
+    except (ValueError, OverflowError):
+        return default
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return min(dt.timestamp(), default)
+
+
+class StreamRunner:
+    """Poll news for the watchlist and update predictions as articles arrive."""
+
+    def __init__(self, entries: List[Dict], events_path: Path = STREAM_EVENTS,
+                 query: str = "stock market", page_size: int = 20, seen_limit: int = 50000) -> None:
+        self.entries = [e for e in entries if e.get("symbol")]
+        self.events_path = Path(events_path)
+        self.query = query
+        self.page_size = page_size
+        self.seen_limit = seen_limit
+        self.fetcher = NewsFetcher()
+        self.matcher = RelevanceMatcher(keyword_map={e["symbol"]: e.get("keywords", []) for e in self.entries})
+        self.analyzer = SentimentAnalyzer()
+        self.predictor = StreamPredictor()
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    def _unseen(self, symbol: str, articles: List[Dict]) -> List[Dict]:
+        fresh = []
+        for art in articles:
+            key = f"{symbol}|{art.get('url') or art.get('title', '')}"
+            if key in self._seen:
+                continue
+            self._seen[key] = None
+            fresh.append(art)
+        while len(self._seen) > self.seen_limit:
+            self._seen.popitem(last=False)
+        return fresh
+
+    def poll_once(self) -> List[Dict]:
+        """Process articles that arrived since the last poll and return flip events."""
+        symbols, groups = [], []
+        for entry in self.entries:
+            symbol = entry["symbol"]
+            try:
+                articles = self.fetcher.fetch(f"{symbol} {self.query}", page_size=self.page_size)
+            except Exception as e:
+                logging.exception("Failed to fetch news for %s: %s", symbol, e)
+                continue
+            matched = self.matcher.match_headlines(self._unseen(symbol, articles), symbol)
+            if matched:
+                symbols.append(symbol)
+                groups.append(collapse_near_duplicates(matched))
+
+        now = time.time()
+        events = []
+        if groups:
+            for symbol, group in zip(symbols, self.analyzer.analyze_many(groups)):
+                event = self.predictor.ingest(symbol, [(i, _timestamp(i.published_at, now)) for i in group])
+                if event:
+                    events.append(event)
+        events.extend(self.predictor.refresh(now))
+        self._record(events)
+        return events
+
+    def _record(self, events: List[Dict]) -> None:
+        if not events:
+            return
+        self.events_path.parent.mkdir(exist_ok=True)
+        with open(self.events_path, "a") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+                logging.info(
+                    "%s flipped to %s (%s confidence)", event["symbol"], event["direction"], event["confidence"]["label"]
+                )
+
+    def run(self, interval: float = 300.0) -> None:
+        """Poll every ``interval`` seconds until interrupted."""
+        while True:
+            try:
+                self.poll_once()
+            except Exception as e:
+                logging.exception("Stream poll failed: %s", e)
+            time.sleep(interval)
@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+from budget import BudgetPlanner
+
+
+def _write_reports(report_dir: Path):
+    report_dir.mkdir()
+    for day, busy_score in [('2025-07-28', 0.5), ('2025-07-29', -0.5), ('2025-07-30', 0.4)]:
+        results = [
+            {'symbol': 'BUSY', 'headlines': ['a'] * 8, 'prediction': {'score': busy_score}},
+            {'symbol': 'QUIET', 'headlines': [], 'prediction': {'score': 0.0}, 'fidelity': 'cached'},
+        ]
+        (report_dir / f'stock_report_{day}.json').write_text(json.dumps({'date': day, 'results': results}))
+
+
+def test_plan_favours_active_symbols(tmp_path: Path):
+    _write_reports(tmp_path / 'reports')
+    planner = BudgetPlanner(tmp_path / 'reports', tmp_path / 'state.json')
+    plan = planner.plan(['BUSY', 'QUIET', 'NEW'], news_quota=2, llm_quota=10)
+    assert plan['QUIET'].skipped
+    assert plan['BUSY'].page_size > 5 and plan['NEW'].page_size > 5
+    assert plan['BUSY'].llm_calls + plan['NEW'].llm_calls == 10
+
+    carried = planner.carry_forward('QUIET')
+    assert carried.stale and carried.as_of == '2025-07-30'
+    assert carried.to_dict()['stale'] is True
+    assert 'fidelity' not in carried.to_dict()
+
+
+def test_quiet_symbols_polled_every_few_runs(tmp_path: Path):
+    _write_reports(tmp_path / 'reports')
+    planner = BudgetPlanner(tmp_path / 'reports', tmp_path / 'state.json', quiet_every=2)
+    polled = [not planner.plan(['BUSY', 'QUIET'], 5, 5)['QUIET'].skipped for _ in range(4)]
+    assert polled == [True, False, True, False]
+
+
+def test_velocity_uses_uncapped_news_volume(tmp_path: Path):
+    (tmp_path / 'reports').mkdir()
+    # WIDE kept more articles only because it was given a larger page last time.
+    results = [
+        {'symbol': 'WIDE', 'headlines': ['a'] * 20, 'news_volume': 30, 'prediction': {'score': 0.1}},
+        {'symbol': 'CAPPED', 'headlines': ['a'] * 5, 'news_volume': 900, 'prediction': {'score': 0.1}},
+    ]
+    (tmp_path / 'reports' / 'stock_report_2025-07-30.json').write_text(json.dumps({'date': '2025-07-30', 'results': results}))
+    planner = BudgetPlanner(tmp_path / 'reports', tmp_path / 'state.json')
+    plan = planner.plan(['WIDE', 'CAPPED'], news_quota=2, llm_quota=10)
+    assert plan['CAPPED'].page_size > plan['WIDE'].page_size
+    assert plan['CAPPED'].llm_calls > plan['WIDE'].llm_calls
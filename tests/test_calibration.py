@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from calibration import GLOBAL, CalibrationModel, isotonic
+from run_model import SymbolResult
+
+
+def _records(symbol: str, start: int, hits: list[bool], confidence: int = 80):
+    return [
+        {'date': f'2025-07-{start + i:02d}', 'symbol': symbol, 'confidence': confidence, 'accuracy': hit}
+        for i, hit in enumerate(hits)
+    ]
+
+
+def _append(log: Path, records):
+    with open(log, 'a') as f:
+        for r in records:
+            f.write(json.dumps(r) + '\n')
+
+
+def test_isotonic_pools_violators():
+    assert isotonic([0.2, 0.6, 0.4, 0.8], [1, 1, 1, 1]) == [0.2, 0.5, 0.5, 0.8]
+
+
+def test_incremental_update_matches_rebuild(tmp_path: Path):
+    log = tmp_path / 'log.jsonl'
+    _append(log, _records('ABC', 1, [True, False, False, False] * 3))
+    model = CalibrationModel(tmp_path / 'model.json', log)
+    assert model.update() == 12
+    model.save()
+
+    # A matured-horizon re-append of an evaluated record is not counted again.
+    _append(log, _records('ABC', 1, [True]) + _records('XYZ', 1, [True, True]))
+    loaded = CalibrationModel.load(tmp_path / 'model.json', log)
+    assert loaded.update() == 2
+    rebuilt = CalibrationModel(tmp_path / 'other.json', log)
+    rebuilt.update()
+    assert loaded.counts == rebuilt.counts and loaded.curves == rebuilt.curves
+    assert loaded.counts[GLOBAL]['totals'][8] == 14
+
+
+def test_apply_lowers_overconfident_predictions(tmp_path: Path):
+    log = tmp_path / 'log.jsonl'
+    _append(log, _records('ABC', 1, [True, False, False, False] * 5))
+    model = CalibrationModel(tmp_path / 'model.json', log)
+    model.update()
+    fresh = SymbolResult('ABC', score=0.5, confidence_value=80.0, confidence_label='High')
+    stale = SymbolResult('ABC', score=0.5, confidence_value=80.0, confidence_label='High', as_of='2025-07-29')
+    model.apply([fresh, stale])
+    assert fresh.raw_confidence == 80.0
+    assert fresh.confidence_value < 60 and fresh.confidence_label != 'High'
+    # Recommendation thresholds were tuned for the raw scale, so they keep using it.
+    assert (fresh.recommendation, fresh.turnover) == ('BUY', '2-3 days')
+    assert fresh.to_dict()['prediction']['confidence']['raw'] == 80.0
+    reloaded = SymbolResult.from_dict(fresh.to_dict())
+    assert (reloaded.recommendation, reloaded.turnover) == ('BUY', '2-3 days')
+    assert stale.confidence_value == 80.0
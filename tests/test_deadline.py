@@ -0,0 +1,64 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+from deadline import CACHED, FULL, REDUCED, Deadline, NewsCache, parse_deadline
+from gather.pipeline import SymbolPipeline
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_choose_degrades_as_time_runs_out():
+    clock = Clock()
+    deadline = Deadline(100.0, reserve=0.0, clock=clock)
+    assert deadline.choose(10) == FULL
+    deadline.record(FULL, 20.0)
+    clock.now = 20.0
+    # 9 more full symbols need 180s but only 80s remain; reduced ones need 54s.
+    assert deadline.choose(9) == REDUCED
+    deadline.record(REDUCED, 15.0)
+    clock.now = 70.0
+    assert deadline.choose(8) == CACHED
+    clock.now = 101.0
+    assert deadline.choose(1) == CACHED
+
+
+def test_parse_deadline():
+    now = datetime(2025, 7, 30, 5, 0)
+    assert parse_deadline('06:30', now) == datetime(2025, 7, 30, 6, 30).timestamp()
+    assert parse_deadline('900', now) == now.timestamp() + 900
+    # A clock time that passed recently is an expired deadline, not tomorrow's.
+    assert parse_deadline('04:30', now) == datetime(2025, 7, 30, 4, 30).timestamp()
+    # Only one more than half a day in the past rolls over.
+    assert parse_deadline('04:30', datetime(2025, 7, 30, 17, 0)) == datetime(2025, 7, 31, 4, 30).timestamp()
+
+
+def test_paced_run_marks_degraded_symbols(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv('NEWS_API_KEY', 'x')
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    report = {'date': '2025-07-29', 'results': [
+        {'symbol': 'BBB', 'items': [{'title': 'BBB shares rally', 'relevance_score': 1.0}]},
+    ]}
+    (tmp_path / 'stock_report_2025-07-29.json').write_text(json.dumps(report))
+
+    entries = [{'symbol': 'AAA', 'keywords': ['AAA']}, {'symbol': 'BBB', 'keywords': ['BBB']}]
+    pipeline = SymbolPipeline(entries)
+    pipeline.news_cache = NewsCache(tmp_path)
+    clock = Clock()
+
+    def iter_articles(query, page_size=5, meta=None):
+        clock.now += 90.0
+        yield {'title': 'AAA beats estimates'}
+
+    pipeline.fetcher.iter_articles = iter_articles
+    results = pipeline.run_many(entries, deadline=Deadline(100.0, reserve=0.0, clock=clock))
+    assert [r.fidelity for r in results] == [FULL, CACHED]
+    assert results[1].headlines == ['BBB shares rally']
+    assert results[1].to_dict()['fidelity'] == CACHED
+    assert 'fidelity' not in results[0].to_dict()
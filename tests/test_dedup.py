@@ -0,0 +1,22 @@
+from gather.dedup import collapse_near_duplicates
+from records import Headline
+
+
+def test_collapse_near_duplicates_keeps_first_with_cluster_size():
+    items = [
+        Headline('Apple shares rise after earnings beat', 1.0),
+        Headline('Microsoft launches new Surface laptops', 0.9),
+        Headline('Apple stock rises after earnings beat', 0.8),
+        Headline('Apple shares rise after earnings beat - Reuters', 0.7),
+    ]
+    collapsed = collapse_near_duplicates(items)
+    assert [c.title for c in collapsed] == [
+        'Apple shares rise after earnings beat',
+        'Microsoft launches new Surface laptops',
+    ]
+    assert [c.cluster_size for c in collapsed] == [3, 1]
+
+
+def test_short_unrelated_headlines_stay_separate():
+    items = [Headline('Is Intel Stock A Buy Now?'), Headline('Buy AMZN Stock At $230?')]
+    assert len(collapse_near_duplicates(items)) == 2
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from discovery import Automaton, DiscoveryEngine, SecuritiesIndex
+
+
+def test_automaton_matches_whole_words():
+    auto = Automaton()
+    auto.add('Intel', 'INTC')
+    auto.add('Meta', 'META')
+    auto.build()
+    found = [v for _, _, v in auto.iter_matches('Intelligent metadata: Intel and Meta rally')]
+    assert found == ['INTC', 'META']
+
+
+def test_engine_ranks_unseen_mentions(tmp_path: Path):
+    index = SecuritiesIndex({
+        'AVGO': {'name': 'Broadcom', 'aliases': ['VMware']},
+        'SPOT': {'name': 'Spotify', 'aliases': []},
+    })
+    engine = DiscoveryEngine(index, state_path=tmp_path / 'state.json')
+    articles = [
+        {'url': 'a', 'title': 'Broadcom closes VMware deal'},
+        {'url': 'b', 'title': 'Chip stocks: (AVGO) jumps'},
+        {'url': 'c', 'title': 'Spotify raises prices'},
+    ]
+    assert engine.ingest(articles, today='2025-07-30') == 3
+    assert engine.ingest(articles, today='2025-07-30') == 0
+    assert engine.rank(min_mentions=2) == [('AVGO', 2)]
+    assert engine.rank(exclude={'AVGO'}, min_mentions=1) == [('SPOT', 1)]
@@ -36,17 +36,60 @@ def test_fetch_actual_direction_up(monkeypatch):
 
 
 def test_evaluate_creates_file(monkeypatch, tmp_path):
-    report = {"date": "2025-07-30", "results": [{"symbol": "ABC", "prediction": {"direction": "up", "confidence": {"value": 70}}}]}
+    report = {"date": "2025-07-30", "results": [
+        {"symbol": "ABC", "prediction": {"direction": "up", "confidence": {"value": 70}}},
+        {"symbol": "OLD", "stale": True, "as_of": "2025-07-28", "prediction": {"direction": "up"}},
+    ]}
     report_path = tmp_path / "report.json"
     report_path.write_text(json.dumps(report))
     hist_path = tmp_path / "history.jsonl"
     monkeypatch.setattr(evaluator_mod, "HISTORY_LOG", hist_path)
     monkeypatch.setattr(Evaluator, "_previous_report", lambda self: report_path)
-    monkeypatch.setattr(Evaluator, "_fetch_actual_direction", lambda self, s, d: "down")
+    monkeypatch.setattr(Evaluator, "_fetch_series", lambda self, s: [("2025-07-30", 100.0), ("2025-07-31", 99.0)])
     monkeypatch.setattr(evaluator_mod, "EVAL_DIR", tmp_path)
+    monkeypatch.setattr(evaluator_mod, "REPORT_DIR", tmp_path)
     evalr = Evaluator(stock_api_key="k", committer=DummyCommitter())
-    out = evalr.evaluate(["ABC"], commit=False)
+    out = evalr.evaluate(["ABC", "OLD"], commit=False)
     assert out.exists()
     data = out.read_text()
     assert "ABC" in data
     assert hist_path.exists()
+    # The stale OLD prediction is not evaluated again.
+    record, = [json.loads(line) for line in hist_path.read_text().splitlines()]
+    assert record["actual_direction"] == "down"
+    assert record["horizons"]["3"] is None
+
+
+def test_horizon_outcomes_use_trading_days():
+    evalr = Evaluator(stock_api_key="k", committer=DummyCommitter())
+    series = [("2025-07-25", 100.0), ("2025-07-28", 102.0), ("2025-07-29", 101.0), ("2025-07-30", 98.0)]
+    outcomes = evalr._horizon_outcomes(series, datetime(2025, 7, 25), horizons=(1, 3, 5))
+    assert outcomes["1"] == {"direction": "up", "return": 0.02}
+    assert outcomes["3"] == {"direction": "down", "return": -0.02}
+    assert outcomes["5"] is None
+
+
+def test_weekend_report_uses_previous_close():
+    evalr = Evaluator(stock_api_key="k", committer=DummyCommitter())
+    series = [("2025-07-25", 100.0), ("2025-07-28", 103.0)]
+    outcomes = evalr._horizon_outcomes(series, datetime(2025, 7, 26), horizons=(1,))
+    assert outcomes["1"] == {"direction": "up", "return": 0.03}
+
+
+def test_matured_horizons_reads_pending_from_log_tail(monkeypatch, tmp_path):
+    from evaluation.evaluator import _reverse_lines
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    days = [f"2025-06-{d:02d}" for d in range(1, 31)]
+    for day in days:
+        (reports / f"stock_report_{day}.json").write_text("{}")
+    hist_path = tmp_path / "history.jsonl"
+    lines = [{"date": d, "symbol": "ABC", "horizons": {"1": {"accuracy": True}}} for d in days]
+    lines.append({"date": days[20], "symbol": "ABC", "horizons": {"1": {"accuracy": True}, "3": {"accuracy": False}}})
+    hist_path.write_text("\n".join(json.dumps(r) for r in lines) + "\n")
+    monkeypatch.setattr(evaluator_mod, "HISTORY_LOG", hist_path)
+    monkeypatch.setattr(evaluator_mod, "REPORT_DIR", reports)
+    evalr = Evaluator(stock_api_key="k", committer=DummyCommitter())
+    matured = evalr._matured_horizons({(days[20], "ABC"), (days[25], "ABC")})
+    assert matured == {(days[20], "ABC"): {"1", "3"}, (days[25], "ABC"): {"1"}}
+    assert [json.loads(l)["date"] for l in _reverse_lines(hist_path, block=16)][:2] == [days[20], days[29]]
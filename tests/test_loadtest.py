@@ -0,0 +1,44 @@
+import pytest
+import requests
+
+from gather.news_fetcher import NewsFetcher
+from loadtest.harness import percentile, run_size
+from loadtest.stubs import AlphaVantageStub, NewsApiStub, OpenAIStub, StubConfig
+
+
+def test_news_stub_serves_fetcher():
+    with NewsApiStub(StubConfig(seed=1)) as stub:
+        fetcher = NewsFetcher(api_key="stub", base_url=f"{stub.url}/v2/everything")
+        articles = fetcher.fetch("AAPL stock market", page_size=3)
+    assert len(articles) == 3
+    assert all(a["title"].startswith("AAPL ") for a in articles)
+    assert stub.calls["ok"] == 1
+
+
+def test_throttled_stubs():
+    with NewsApiStub(StubConfig(throttle_rate=1.0)) as news, AlphaVantageStub(StubConfig(throttle_rate=1.0)) as stock:
+        with pytest.raises(requests.HTTPError):
+            NewsFetcher(api_key="stub", base_url=f"{news.url}/v2/everything").fetch("AAPL")
+        body = requests.get(f"{stock.url}/query", params={"symbol": "AAPL"}, timeout=5).json()
+    assert "Note" in body and "Time Series (Daily)" not in body
+    assert news.calls["throttled"] == 1
+
+
+def test_percentile():
+    assert percentile([3, 1, 2, 4, 5], 50) == 3
+    assert percentile([], 99) == 0.0
+
+
+def test_run_size_reaches_every_stub():
+    stubs = {'news': NewsApiStub(StubConfig(seed=1)), 'openai': OpenAIStub(StubConfig(seed=1)),
+             'stock': AlphaVantageStub(StubConfig(seed=1))}
+    for stub in stubs.values():
+        stub.start()
+    try:
+        row = run_size(2, stubs)
+    finally:
+        for stub in stubs.values():
+            stub.stop()
+    assert row['calls_per_symbol']['news'] == 1
+    assert row['calls_per_symbol']['openai'] > 0
+    assert row['sentiment']['escalated'] == stubs['openai'].calls['ok']
@@ -0,0 +1,26 @@
+import reporting.markdown_reporter as reporter_mod
+from reporting.markdown_reporter import MarkdownReporter
+
+
+def test_generate_batch_report_single_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(reporter_mod, 'REPORT_DIR', tmp_path)
+    insights = [
+        {'affected_entities': ['abc'], 'sentiment': 0.5, 'confidence_score': 80, 'rationale': 'Strong demand'},
+        {'affected_entities': ['XYZ'], 'sentiment': -0.4, 'confidence_score': 50},
+    ]
+    news = {'ABC': [{'title': 'Alpha beats'}], 'XYZ': [{'title': 'Xylo misses'}]}
+    path = MarkdownReporter().generate_batch_report(news, insights, commit=False)
+    text = path.read_text()
+    assert list(tmp_path.iterdir()) == [path]
+    assert '## ABC' in text and '## XYZ' in text
+    assert 'Predicted movement score: +0.50' in text
+    assert 'Predicted movement score: -0.40' in text
+    assert text.count('## Process Diagram') == 1
+
+
+def test_generate_report_uses_batch_layout(monkeypatch, tmp_path):
+    monkeypatch.setattr(reporter_mod, 'REPORT_DIR', tmp_path)
+    insights = [{'affected_entities': ['ABC'], 'sentiment': 0.2, 'confidence_score': 60}]
+    path = MarkdownReporter().generate_report([{'title': 'Alpha beats'}], insights, 0.2, 'ABC', commit=False)
+    text = path.read_text()
+    assert '## ABC' in text and 'Matching insights: 1' in text
@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from gather.news_fetcher import iter_json_array
+
+
+def test_iter_json_array_across_chunk_boundaries():
+    body = json.dumps({'status': 'ok', 'totalResults': 1234,
+                       'articles': [{'title': 'Alpha ] "quoted" é'}, {'title': 'Beta'}]}).encode()
+    for size in (1, 3, 64):
+        chunks = (body[i:i + size] for i in range(0, len(body), size))
+        meta = {}
+        assert [a['title'] for a in iter_json_array(chunks, 'articles', meta)] == ['Alpha ] "quoted" é', 'Beta']
+        assert meta == {'status': 'ok', 'totalResults': 1234}
+
+
+def test_iter_json_array_raises_on_truncated_body():
+    body = json.dumps({'status': 'ok', 'articles': [{'title': 'Alpha'}, {'title': 'Beta'}]}).encode()
+    articles = iter_json_array([body[:-20]], 'articles')
+    assert next(articles) == {'title': 'Alpha'}
+    with pytest.raises(json.JSONDecodeError):
+        next(articles)
@@ -0,0 +1,22 @@
+from gather.pipeline import FETCH_WINDOW, SymbolPipeline
+
+
+def test_matched_keeps_most_relevant_of_a_larger_window(monkeypatch):
+    monkeypatch.setenv('NEWS_API_KEY', 'x')
+    entries = [{'symbol': 'ABC', 'keywords': ['Alpha']}]
+    pipeline = SymbolPipeline(entries)
+    requested = []
+
+    def iter_articles(query, page_size=5, meta=None):
+        requested.append(page_size)
+        meta['totalResults'] = 250
+        yield {'title': 'Unrelated market wrap'}
+        yield {'title': 'Alpha beats estimates'}
+        yield {'title': 'Alpha recalls product'}
+
+    pipeline.fetcher.iter_articles = iter_articles
+    matched = pipeline._matched(entries[0], page_size=1)
+    assert requested == [FETCH_WINDOW]
+    assert [m.title for m in matched] == ['Alpha beats estimates']
+    assert pipeline._result(entries[0], matched).news_volume == 250
+    assert pipeline.news_volume == {}
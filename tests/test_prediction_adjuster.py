@@ -13,3 +13,40 @@ def test_analyze_metrics(tmp_path: Path):
     metrics = analyze(log_path=log_path, days=7)
     assert metrics["ABC"]["accuracy_rate"] == 0.5
     assert metrics["XYZ"]["accuracy_rate"] == 1.0
+
+
+def test_analyze_horizon_accuracy_uses_latest_record(tmp_path: Path):
+    import json
+    from datetime import datetime
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    first = {"date": today, "symbol": "ABC", "predicted_direction": "up", "confidence": 70, "accuracy": True,
+             "horizons": {"1": {"direction": "up", "accuracy": True}, "3": None}}
+    matured = dict(first, horizons={"1": {"direction": "up", "accuracy": True},
+                                    "3": {"direction": "down", "accuracy": False}})
+    log_path = tmp_path / "log.jsonl"
+    log_path.write_text("\n".join(json.dumps(r) for r in [first, matured]))
+    metrics = analyze(log_path=log_path, days=7)
+    assert metrics["ABC"]["horizon_accuracy"] == {"1": 1.0, "3": 0.0}
+    assert metrics["ABC"]["accuracy_rate"] == 1.0
+
+
+def test_analyze_horizon_windows_reach_back_for_long_horizons(tmp_path: Path):
+    import json
+    from datetime import datetime, timedelta
+    today = datetime.utcnow().date()
+
+    def record(days_ago, horizons):
+        return {"date": (today - timedelta(days=days_ago)).isoformat(), "symbol": "ABC",
+                "predicted_direction": "up", "confidence": 60, "accuracy": True,
+                "horizons": {h: {"direction": "up", "accuracy": hit} for h, hit in horizons.items()}}
+
+    log_path = tmp_path / "log.jsonl"
+    log_path.write_text("\n".join(json.dumps(r) for r in [
+        record(1, {"1": True}),
+        record(12, {"1": True, "5": False}),
+        record(20, {"1": False, "10": True}),
+        record(40, {"10": False}),
+    ]))
+    metrics = analyze(log_path=log_path, days=7)
+    assert metrics["ABC"]["horizon_accuracy"] == {"1": 1.0, "5": 0.0, "10": 1.0}
+    assert metrics["ABC"]["accuracy_rate"] == 1.0
@@ -0,0 +1,17 @@
+from records import EvaluationRecord, Headline
+
+
+def test_headline_round_trips_json_shape():
+    data = {'title': 'Alpha soars', 'sentiment': 0.4, 'relevance_score': 1.0,
+            'keyword': 'Alpha', 'publishedAt': '2025-07-30', 'cluster_size': 2}
+    record = Headline.from_dict(data)
+    assert record.published_at == '2025-07-30'
+    assert record.to_dict() == data
+    assert Headline.coerce(record) is record
+    assert not hasattr(record, '__dict__')
+
+
+def test_evaluation_record_to_dict():
+    record = EvaluationRecord('2025-07-30', 'ABC', 'up', 'down', 70, False)
+    assert record.to_dict()['accuracy'] is False
+    assert record.to_dict()['horizons'] == {}
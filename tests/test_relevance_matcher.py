@@ -1,4 +1,3 @@
-import pytest
 from relevance_matcher import RelevanceMatcher
 
 
@@ -17,4 +16,17 @@ def test_match_headlines_threshold():
     ]
     matches = matcher.match_headlines(items, 'ABC', threshold=0.5)
     assert len(matches) == 1
-    assert matches[0]['title'] == 'Alpha announces earnings'
+    assert matches[0].title == 'Alpha announces earnings'
+    assert matches[0].published_at == '2025-07-30'
+
+
+def test_match_headlines_limit_keeps_top_matches_lazily():
+    matcher = RelevanceMatcher({'ABC': ['Alpha']})
+    items = iter([
+        {'title': 'Alpha one'},
+        {'title': 'Unrelated story about beta'},
+        {'title': 'Alpha two'},
+        {'title': 'Alpha three'},
+    ])
+    matches = matcher.match_headlines(items, 'ABC', threshold=0.5, limit=2)
+    assert [m.title for m in matches] == ['Alpha one', 'Alpha two']
@@ -12,3 +12,32 @@ def test_recommendation_and_turnover():
     rec, turn = writer.recommendation_and_turnover(0.0, 40, 'Medium')
     assert rec == 'HOLD'
     assert turn == '4-7 days'
+
+
+def test_write_run_renders_all_formats(monkeypatch, tmp_path):
+    import report_writer
+    from run_model import RunModel, SymbolResult
+
+    class DummyCommitter:
+        def add_and_commit(self, path, message):
+            pass
+
+    monkeypatch.setattr(report_writer, 'REPORT_DIR', tmp_path)
+    run = RunModel(date='2025-07-30')
+    run.results.append(SymbolResult(
+        symbol='ABC',
+        company='Alpha',
+        items=[{'title': 'Alpha soars', 'sentiment': 0.6}],
+        score=0.4,
+        direction='up',
+        confidence_value=70,
+        confidence_label='High',
+    ))
+    run.metrics = {'ABC': {'accuracy_rate': 0.5, 'avg_confidence': 70, 'calibration': 'Overconfident'}}
+    paths = ReportWriter(committer=DummyCommitter()).write_run(run, commit=False)
+    assert set(paths) == {'json', 'summary', 'markdown'}
+    summary = paths['summary'].read_text()
+    assert '"Alpha soars" → positive sentiment' in summary
+    assert 'Accuracy trend (last 7 days): 50% accurate' in summary
+    assert '## ABC (Alpha)' in paths['markdown'].read_text()
+    assert '"action": "BUY"' in paths['json'].read_text()
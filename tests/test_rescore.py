@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+import rescore as rescore_mod
+from rescore import rescore
+
+
+def test_rescore_writes_parallel_archive_and_resumes(monkeypatch, tmp_path: Path):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
+    class Store:
+        def load(self):
+            return []
+
+    monkeypatch.setattr(rescore_mod, 'WatchlistStore', Store)
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    original = {'date': '2025-07-30', 'results': [{
+        'symbol': 'AAPL', 'company': 'Apple',
+        'headlines': ['Apple posts excellent record profits'],
+        'prediction': {'score': 0.0, 'direction': 'neutral', 'confidence': {'label': 'Low', 'value': 0}},
+    }]}
+    src = reports / 'stock_report_2025-07-30.json'
+    src.write_text(json.dumps(original))
+
+    out_dir = rescore('test', workers=1, report_dir=reports, out_root=tmp_path / 'rescored')
+    rescored = json.loads((out_dir / src.name).read_text())
+    assert rescored['results'][0]['prediction']['direction'] == 'up'
+    assert json.loads(src.read_text()) == original
+
+    (out_dir / src.name).unlink()
+    rescore('test', workers=1, report_dir=reports, out_root=tmp_path / 'rescored')
+    assert not (out_dir / src.name).exists()
+
+
+def test_rescore_chunk_keeps_stats_per_report(monkeypatch, tmp_path: Path):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    paths = []
+    for day, count in [('2025-07-29', 2), ('2025-07-30', 1)]:
+        report = {'date': day, 'results': [{'symbol': 'AAPL', 'headlines': [f'Apple news {day} {i}' for i in range(count)]}]}
+        path = tmp_path / f'stock_report_{day}.json'
+        path.write_text(json.dumps(report))
+        paths.append(str(path))
+    out = tmp_path / 'out'
+    out.mkdir()
+    rescore_mod._rescore_chunk(paths, str(out), {'AAPL': ['Apple']})
+    stats = [json.loads((out / Path(p).name).read_text())['stats']['headlines'] for p in paths]
+    assert stats == [2, 1]
+
+
+def test_rescore_chunk_calibrates_confidence(monkeypatch, tmp_path: Path):
+    from calibration import CalibrationModel
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    model = CalibrationModel(tmp_path / 'model.json')
+    model.curves = {'*': [0.1] * 10}
+    monkeypatch.setattr(rescore_mod.CalibrationModel, 'load', classmethod(lambda cls: model))
+    report = {'date': '2025-07-30', 'results': [{'symbol': 'AAPL', 'headlines': ['Apple posts excellent record profits']}]}
+    path = tmp_path / 'stock_report_2025-07-30.json'
+    path.write_text(json.dumps(report))
+    out = tmp_path / 'out'
+    out.mkdir()
+    rescore_mod._rescore_chunk([str(path)], str(out), {'AAPL': ['Apple']})
+    confidence = json.loads((out / path.name).read_text())['results'][0]['prediction']['confidence']
+    assert round(confidence['value']) == 10 and confidence['raw'] > 10
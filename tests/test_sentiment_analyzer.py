@@ -19,3 +19,82 @@ def test_confidence_scoring():
     value, label = analyzer.confidence(items)
     assert 0 <= value <= 100
     assert label in {'High', 'Medium', 'Low'}
+
+
+def test_analyze_many_runs_requests_concurrently(monkeypatch):
+    import math
+    import time
+    from loadtest.stubs import OpenAIStub, StubConfig
+
+    groups = [
+        [{'title': f'headline {i}'} for i in range(12)],
+        [{'title': 'headline 0'}, {'title': 'headline 5'}] + [{'title': f'other {i}'} for i in range(4)],
+    ]
+    unique = {i['title'] for g in groups for i in g}
+    with OpenAIStub(StubConfig(latency_ms=100, seed=1)) as stub:
+        monkeypatch.setenv('OPENAI_API_KEY', 'test')
+        monkeypatch.setenv('OPENAI_API_BASE', f'{stub.url}/v1')
+        analyzer = SentimentAnalyzer(max_in_flight=8)
+        start = time.monotonic()
+        results = analyzer.analyze_many(groups)
+        elapsed = time.monotonic() - start
+    rounds = math.ceil(len(unique) / 8)
+    assert rounds * 0.1 <= elapsed < rounds * 0.1 + 0.3
+    # Titles shared between groups are requested once.
+    assert stub.calls['ok'] == len(unique)
+    assert [r.title for r in results[0]] == [f'headline {i}' for i in range(12)]
+    assert results[1][0].sentiment == results[0][0].sentiment
+    assert analyzer.stats == {'headlines': len(unique), 'local': 0, 'escalated': len(unique)}
+
+
+def test_failed_llm_requests_fall_back_and_count_as_local(monkeypatch):
+    from textblob import TextBlob
+
+    def llm_polarity(self, title):
+        if title == 'broken':
+            raise RuntimeError('boom')
+        return 0.5
+
+    monkeypatch.setattr(SentimentAnalyzer, '_llm_polarity', llm_polarity)
+    analyzer = SentimentAnalyzer(max_in_flight=4)
+    analyzer.api_key = 'test'
+    results = analyzer.analyze_many([[{'title': 'fine'}, {'title': 'broken'}]])
+    assert [r.sentiment for r in results[0]] == [0.5, TextBlob('broken').sentiment.polarity]
+    assert analyzer.stats == {'headlines': 2, 'local': 1, 'escalated': 1}
+
+
+def test_cascade_escalates_only_ambiguous_or_dominant_headlines(monkeypatch):
+    analyzer = SentimentAnalyzer(cascade=True, escalate_below=0.15, escalate_share=0.5)
+    analyzer.api_key = 'test'
+    sent = []
+    monkeypatch.setattr(analyzer, '_llm_polarity', lambda title: sent.append(title) or 0.9)
+    groups = [
+        [
+            {'title': 'Great record profits', 'relevance_score': 1.0},
+            {'title': 'Terrible awful losses', 'relevance_score': 1.0},
+            {'title': 'Company holds meeting', 'relevance_score': 1.0},
+        ],
+        # Too small for the share rule: a lone headline always carries all the weight.
+        [{'title': 'Wonderful excellent quarter', 'relevance_score': 1.0}],
+        [
+            {'title': 'Superb strong growth', 'relevance_score': 1.0, 'cluster_size': 4},
+            {'title': 'Happy good customers', 'relevance_score': 0.5},
+            {'title': 'Bad poor outlook', 'relevance_score': 0.5},
+        ],
+    ]
+    results = analyzer.analyze_many(groups)
+    assert sorted(sent) == ['Company holds meeting', 'Superb strong growth']
+    assert results[0][2].sentiment == 0.9
+    assert results[0][0].sentiment > 0.15
+    assert analyzer.stats == {'headlines': 7, 'local': 5, 'escalated': 2}
+
+
+def test_weighted_score_measures_recency_from_reference_time():
+    analyzer = SentimentAnalyzer()
+    items = [
+        {'sentiment': 0.8, 'relevance_score': 1.0, 'publishedAt': '2025-07-30T12:00:00Z'},
+        {'sentiment': -0.8, 'relevance_score': 1.0, 'publishedAt': '2025-07-25T12:00:00Z'},
+    ]
+    assert analyzer.weighted_score(items, datetime(2025, 7, 31)) > 0
+    # Far from the reference time both headlines sit at the recency floor and cancel out.
+    assert analyzer.weighted_score(items, datetime(2025, 9, 1)) == 0
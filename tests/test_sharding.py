@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import sharding
+from sharding import merge_shards, shard_of, shard_path
+
+
+def test_shard_of_is_stable_and_in_range():
+    assert shard_of('AAPL', 4) == shard_of('aapl', 4)
+    assert all(0 <= shard_of(s, 3) < 3 for s in ['AAPL', 'MSFT', 'TSLA', 'NVDA'])
+
+
+def test_merge_shards_orders_by_watchlist(monkeypatch, tmp_path: Path):
+    class Store:
+        def load(self):
+            return [{'symbol': 'AAA'}, {'symbol': 'BBB'}]
+
+    monkeypatch.setattr(sharding, 'WatchlistStore', Store)
+    for i, sym in enumerate(['BBB', 'AAA']):
+        path = shard_path(i, 2, '2025-07-30', tmp_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'results': [{'symbol': sym, 'prediction': {'score': 0.1}}]}))
+    run = merge_shards(2, '2025-07-30', tmp_path)
+    assert [r.symbol for r in run.results] == ['AAA', 'BBB']
+
+    shard_path(1, 2, '2025-07-30', tmp_path).unlink()
+    with pytest.raises(FileNotFoundError):
+        merge_shards(2, '2025-07-30', tmp_path)
+
+
+def test_run_sharded_reruns_unless_resuming(monkeypatch, tmp_path: Path):
+    ran = []
+
+    def fake_run_shard(index, shards, shard_dir, query, date, deadline):
+        ran.append(index)
+        path = shard_path(index, shards, date, shard_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'results': []}))
+        return path
+
+    class Pool:
+        def __init__(self, max_workers):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def submit(self, fn, *args):
+            from concurrent.futures import Future
+            fut = Future()
+            fut.set_result(fn(*args))
+            return fut
+
+    monkeypatch.setattr(sharding, 'run_shard', fake_run_shard)
+    monkeypatch.setattr(sharding, 'ProcessPoolExecutor', Pool)
+    monkeypatch.setattr(sharding, 'merge_shards', lambda shards, date, shard_dir: sharding.RunModel())
+    monkeypatch.setattr(sharding, 'ReportWriter', lambda: type('W', (), {'write_run': lambda self, run, commit: {}})())
+    sharding.run_sharded(2, tmp_path, commit=False)
+    sharding.run_sharded(2, tmp_path, commit=False)
+    assert ran == [0, 1, 0, 1]
+
+    shard_path(1, 2, sharding.datetime.utcnow().strftime('%Y-%m-%d'), tmp_path).unlink()
+    sharding.run_sharded(2, tmp_path, commit=False, resume=True)
+    assert ran == [0, 1, 0, 1, 1]
@@ -16,3 +16,16 @@ def test_predict_no_relevant_insights():
     predictor = StockPredictor()
     insights = [{'affected_entities': ['ABC'], 'sentiment': 1.0, 'confidence_score': 100}]
     assert predictor.predict(insights, 'XYZ') == 0.0
+
+
+def test_predict_batch_matches_single_symbol_predictions():
+    predictor = StockPredictor()
+    insights = [
+        {'affected_entities': ['xyz', 'ABC'], 'sentiment': 0.5, 'confidence_score': 60},
+        {'affected_entities': ['XYZ'], 'sentiment': -0.5, 'confidence_score': 40},
+    ]
+    batch = predictor.predict_batch(insights, ['XYZ', 'ABC', 'QQQ'])
+    assert round(batch['XYZ'], 2) == 0.10
+    assert batch['ABC'] == 0.5
+    assert batch['QQQ'] == 0.0
+    assert batch['XYZ'] == predictor.predict(insights, 'XYZ')
@@ -0,0 +1,29 @@
+import pytest
+
+from records import Headline
+from streaming import DecayedScore, StreamPredictor
+
+DAY = 86400.0
+
+
+def test_decayed_score_matches_full_recompute():
+    acc = DecayedScore(half_life=DAY)
+    items = [(Headline('a', 1.0, sentiment=0.8), 0.0), (Headline('b', 0.5, sentiment=-0.4), 2 * DAY),
+             (Headline('c', 1.0, cluster_size=2, sentiment=0.2), DAY)]
+    for item, ts in items:
+        acc.add(item, ts)
+    weights = [i.relevance_score * i.cluster_size * 0.5 ** ((2 * DAY - ts) / DAY) for i, ts in items]
+    expected = sum(w * i.sentiment for w, (i, _) in zip(weights, items)) / sum(weights)
+    assert acc.score() == pytest.approx(expected)
+
+
+def test_stream_predictor_emits_only_on_flip():
+    predictor = StreamPredictor(half_life=DAY)
+    up = Headline('up', 1.0, sentiment=0.9)
+    first = predictor.ingest('ABC', [(up, 0.0), (up, 1.0), (up, 2.0), (up, 3.0), (up, 4.0)])
+    assert first['direction'] == 'up' and first['previous_direction'] == 'neutral'
+    assert first['confidence']['label'] == 'High'
+    assert predictor.ingest('ABC', [(up, 5.0)]) is None
+    down = predictor.ingest('ABC', [(Headline('down', 1.0, cluster_size=20, sentiment=-0.9), 6.0)])
+    assert down['direction'] == 'down' and down['previous_direction'] == 'up'
+    assert predictor.refresh(7.0) == []
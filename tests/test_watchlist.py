@@ -1,5 +1,5 @@
 from pathlib import Path
-from watchlist import WatchlistManager
+from watchlist import WatchlistManager, WatchlistStore
 
 
 def test_watchlist_load_and_save(tmp_path: Path):
@@ -8,3 +8,34 @@ def test_watchlist_load_and_save(tmp_path: Path):
     data = [{'symbol': 'ABC'}]
     manager.save(data)
     assert manager.load() == data
+
+
+def test_watchlist_store_versions_and_seed(tmp_path: Path):
+    seed = tmp_path / 'wl.json'
+    WatchlistManager(seed).save([{'symbol': 'ABC'}, {'symbol': 'XYZ'}])
+    store = WatchlistStore(tmp_path / 'wl.db', seed=seed)
+    assert [e['symbol'] for e in store.load()] == ['ABC', 'XYZ']
+    version = store.version()
+    store.upsert({'symbol': 'NEW', 'discovered': True})
+    assert store.version() == version + 1
+    assert store.get('NEW') == {'symbol': 'NEW', 'discovered': True}
+    assert store.remove('ABC')
+    assert 'ABC' not in store
+    other = WatchlistStore(tmp_path / 'wl.db', seed=seed)
+    assert other.version() == store.version()
+    assert other.symbols() == {'XYZ', 'NEW'}
+
+
+def test_seed_edits_remove_symbols(tmp_path: Path):
+    import os
+    seed = tmp_path / 'wl.json'
+    WatchlistManager(seed).save([{'symbol': 'ABC'}, {'symbol': 'XYZ'}])
+    WatchlistStore(tmp_path / 'wl.db', seed=seed).close()
+    WatchlistManager(seed).save([{'symbol': 'XYZ'}])
+    os.utime(seed, (seed.stat().st_atime, seed.stat().st_mtime + 5))
+    store = WatchlistStore(tmp_path / 'wl.db', seed=seed)
+    assert store.symbols() == {'XYZ'}
+
+    seed.write_text('{broken')
+    os.utime(seed, (seed.stat().st_atime, seed.stat().st_mtime + 10))
+    assert WatchlistStore(tmp_path / 'wl.db', seed=seed).symbols() == {'XYZ'}
@@ -1,7 +1,9 @@
 import json
 import logging
+import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterator, List
 
 
 class WatchlistManager:
@@ -22,4 +24,133 @@ class WatchlistManager:
         return []
 
     def save(self, entries: List[Dict]) -> None:
-        self.path.write_text(json.dumps(entries, indent=2))
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(entries, indent=2))
+        tmp.replace(self.path)
+
+
+class WatchlistStore:
+    """Watchlist entries keyed by symbol in SQLite.
+
+    Every write runs in its own ``BEGIN IMMEDIATE`` transaction, so concurrent
+    processes serialize on SQLite's file lock instead of overwriting each
+    other. Each write bumps a version counter; callers compare ``version()``
+    with the value they loaded to tell whether their copy is stale.
+
+    When ``seed`` (the JSON watchlist) is newer than the last import, the
+    store is reconciled with it: its entries are upserted and symbols missing
+    from it are removed, so hand edits to the JSON file still take effect.
+    """
+
+    def __init__(self, path: str | Path = "watchlist.db", seed: str | Path | None = "watchlist.json") -> None:
+        self.path = Path(path)
+        self.seed = Path(seed) if seed else None
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "symbol TEXT PRIMARY KEY, position INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL)")
+        self._import_seed()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('version', 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _meta(self, key: str) -> float:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _import_seed(self) -> None:
+        if not self.seed or not self.seed.exists():
+            return
+        mtime = self.seed.stat().st_mtime
+        if mtime <= self._meta("seed_mtime"):
+            return
+        try:
+            entries = json.loads(self.seed.read_text())
+        except Exception as e:
+            # Keep the store as is rather than treating a broken file as an empty watchlist.
+            logging.exception("Failed to parse watchlist seed %s: %s", self.seed, e)
+            return
+        if not isinstance(entries, list):
+            logging.error("Watchlist seed %s is not a list", self.seed)
+            return
+        keep = [e["symbol"] for e in entries if isinstance(e, dict) and e.get("symbol")]
+        with self._write() as conn:
+            conn.execute(
+                f"DELETE FROM entries WHERE symbol NOT IN ({', '.join('?' * len(keep))})", keep
+            )
+            self._upsert(conn, [e for e in entries if isinstance(e, dict)])
+            _set_meta(conn, "seed_mtime", mtime)
+
+    def _upsert(self, conn: sqlite3.Connection, entries: List[Dict]) -> None:
+        for entry in entries:
+            symbol = entry.get("symbol")
+            if not symbol:
+                continue
+            conn.execute(
+                "INSERT INTO entries (symbol, position, data) VALUES "
+                "(?, (SELECT COALESCE(MAX(position), -1) + 1 FROM entries), ?) "
+                "ON CONFLICT(symbol) DO UPDATE SET data = excluded.data",
+                (symbol, json.dumps(entry)),
+            )
+
+    def version(self) -> int:
+        return int(self._meta("version"))
+
+    def get(self, symbol: str) -> Dict | None:
+        row = self._conn.execute("SELECT data FROM entries WHERE symbol = ?", (symbol,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM entries WHERE symbol = ?", (symbol,)).fetchone() is not None
+
+    def symbols(self) -> set[str]:
+        return {row[0] for row in self._conn.execute("SELECT symbol FROM entries")}
+
+    def load(self) -> List[Dict]:
+        """Return all entries in insertion order."""
+        return [json.loads(row[0]) for row in self._conn.execute("SELECT data FROM entries ORDER BY position")]
+
+    def upsert(self, *entries: Dict) -> None:
+        with self._write() as conn:
+            self._upsert(conn, list(entries))
+
+    def remove(self, symbol: str) -> bool:
+        with self._write() as conn:
+            cur = conn.execute("DELETE FROM entries WHERE symbol = ?", (symbol,))
+        return cur.rowcount > 0
+
+    def export_json(self, path: str | Path | None = None) -> None:
+        """Write a JSON snapshot, by default over the seed file."""
+        target = Path(path) if path else self.seed
+        if target is None:
+            return
+        WatchlistManager(target).save(self.load())
+        if target == self.seed:
+            with self._write() as conn:
+                _set_meta(conn, "seed_mtime", target.stat().st_mtime)
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: float) -> None:
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )